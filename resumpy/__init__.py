@@ -1,8 +1,17 @@
+import resumpy.doctor
+import resumpy.fit
+import resumpy.images
+import resumpy.lint
 import resumpy.model
+import resumpy.overlay
+import resumpy.postprocess
 import resumpy.theme
+import resumpy.utils
+import resumpy.validator
+import calendar
 import json
-import jsonschema
 import os
+import pylatex
 import shutil
 import yaml
 
@@ -10,17 +19,20 @@ import yaml
 class CV:
     model = None
     logger = None
+    base_path = None
 
     def __init__(self, logger):
         self.logger = logger
 
-    def load(self, cv_file_path, cv_schema_path):
+    def load(self, cv_file_path, cv_schema_path, lazy=False):
         """Loads the data given in a text file into the model object.
 
         Args:
             cv_file_path (str): path to the file containing the CV data.
             cv_schema_path (str): path to the schema file used to validate
             `cv_file_path`.
+            lazy (bool): whether to convert the fields of the model on their
+                first access instead of at load time.
         """
 
         # Verify cv_schema_path
@@ -44,8 +56,45 @@ class CV:
         # Read, validate and load CV data
         cv_raw = json.load(open(cv_file_path)) if file_extension == '.json' \
             else yaml.full_load(open(cv_file_path))
-        jsonschema.validate(cv_raw, json.load(open(cv_schema_path)))
-        self.model = resumpy.model.Model(cv_raw)
+        resumpy.validator.get_validator(cv_schema_path).validate(cv_raw)
+        self.model = resumpy.model.Model(cv_raw, lazy=lazy)
+        self.base_path = os.path.dirname(os.path.abspath(cv_file_path))
+
+    def apply_overlay(self, overlay_file_path, cv_schema_path):
+        """Creates a new CV applying an overlay on top of the loaded one.
+
+        The overlay is a JSON Merge Patch (RFC 7386) stored in a `.json` or
+        `.yaml` file. Only the parts of the CV modified by the overlay are
+        validated, and the rest of the model is shared with this CV.
+
+        Args:
+            overlay_file_path (str): path to the file containing the overlay.
+            cv_schema_path (str): path to the schema file used to validate
+            the patched CV.
+
+        Returns:
+            CV: new CV object with the overlay applied.
+        """
+        file_extension = os.path.splitext(
+            os.path.basename(overlay_file_path)
+        )[1]
+        if file_extension not in ['.json', '.yaml']:
+            self.logger.error('The extension of --overlay is invalid.')
+            exit()
+        if not os.path.exists(overlay_file_path):
+            self.logger.error('File provided in --overlay is invalid.')
+            exit()
+
+        overlay_raw = json.load(open(overlay_file_path)) \
+            if file_extension == '.json' \
+            else yaml.full_load(open(overlay_file_path))
+        cv = CV(self.logger)
+        cv.base_path = self.base_path
+        cv.model = resumpy.overlay.apply_patch(
+            self.model, overlay_raw,
+            resumpy.validator.get_validator(cv_schema_path).schema
+        )
+        return cv
 
     def save(self, cv_file_path, save_json=True, save_yaml=True):
         """Dumps the loaded CV into JSON and YAML files.
@@ -65,7 +114,51 @@ class CV:
             )
             open(cv_file_path + '.yaml', 'wt').write(cv_raw_yaml)
 
-    def generate(self, theme_name, file_path, keep_tex):
+    def format(self, theme_obj, lint='reject'):
+        """Formats the loaded CV with `theme_obj`, checking its content first.
+
+        The photo of the CV, if any, is prepared for the theme with
+        `resumpy.images.prepare_photo` and stored in its `photo_path`. It has
+        to be copied to the folder of the document before compiling it.
+        Relative paths are resolved from the folder of the loaded file.
+
+        Args:
+            theme_obj (resumpy.theme.Theme): theme used to format the CV.
+            lint (str): what to do with content that would break the LaTeX
+                compilation. See `generate`.
+
+        Returns:
+            tuple: the model which has been formatted, which differs from
+            `self.model` if `lint` is `fix`, and its `pylatex.Document`.
+        """
+        model = self.model
+        if lint is not None:
+            issues = resumpy.lint.lint_model(model)
+            if lint == 'fix':
+                for issue in issues:
+                    if issue.fixed_value is not None:
+                        self.logger.info('Fixed {}'.format(issue))
+                model = resumpy.lint.fix_model(model, issues)
+                issues = resumpy.lint.lint_model(model)
+        theme_obj.photo_path = resumpy.images.prepare_photo(
+            os.path.join(self.base_path or os.getcwd(), model.get(
+                'basic', 'photo'
+            )), theme_obj.photo_size, theme_obj.photo_dpi, self.logger
+        ) if model.get('basic', 'photo') else None
+        doc = theme_obj.format(model)
+        if lint is not None:
+            issues += resumpy.lint.lint_latex(doc.dumps(), model)
+            for issue in issues:
+                self.logger.warning(str(issue))
+            errors = [i for i in issues if i.severity == 'error']
+            if errors:
+                raise resumpy.lint.LintError(errors)
+        return model, doc
+
+    def generate(self, theme_name, file_path, keep_tex, optimize=False,
+                 compiler=None, compiler_args=None, lint='reject',
+                 deterministic=False, reference_date=None, max_pages=None,
+                 drop_order=resumpy.fit.DROP_ORDER, photo_dpi=None):
         """Generates the CV using the data loaded in the CV and the theme named
         `theme_name`.
 
@@ -73,26 +166,108 @@ class CV:
             theme_name (str): name of the theme to use.
             file_path (str): path where the generated file should be stored.
             keep_tex (bool): whether to keep the generated .tex file.
+            optimize (bool): whether to post-process the generated PDF to
+                reduce its size. See `resumpy.postprocess.optimize_pdf`.
+            compiler (str): LaTeX compiler to use. If `None`, PyLaTeX uses
+                `latexmk` or `pdflatex`.
+            compiler_args (list of str): extra arguments of `compiler`.
+            lint (str): what to do with content that would break the LaTeX
+                compilation: `reject` raises `resumpy.lint.LintError` before
+                compiling, `fix` fixes it when possible and rejects the rest,
+                and `None` disables the checks.
+            deterministic (bool): whether to produce the same PDF bytes on
+                every run, pinning `SOURCE_DATE_EPOCH` and omitting dates and
+                IDs from the PDF. Ages are then computed at `last_update`
+                unless `reference_date` is given.
+            reference_date (datetime.date): date used to compute ages.
+                Defaults to today, or to `last_update` if `deterministic`.
+            max_pages (int): maximum number of pages of the generated file.
+                If given, the spacing is condensed and content is trimmed
+                until the CV fits. See `resumpy.fit.fit`.
+            drop_order (list of str): optional sections which can be dropped
+                to fit the CV in `max_pages`, in order.
+            photo_dpi (int): resolution of the photo. Defaults to the
+                `photo_dpi` of the theme.
         """
         theme_obj = resumpy.theme.Theme.create_theme_by_name(
             theme_name, self.logger
         )
+        if deterministic and reference_date is None:
+            reference_date = self.model.get('last_update')
+        theme_obj.reference_date = reference_date
+        if photo_dpi is not None:
+            theme_obj.photo_dpi = photo_dpi
+
+        # Get doc object, checking its content before spending a LaTeX run
+        model, doc = self.format(theme_obj, lint)
+
+        # Refuse to compile if the TeX installation can not compile the theme
+        resumpy.doctor.preflight(theme_name, compiler)
 
-        # Copy .cls file into the folder
+        # Copy .cls file and the photo into the folder
         cls_path = os.path.join(
             os.path.dirname(__file__), 'themes', 'cls', theme_name + '.cls'
         )
-        shutil.copy(cls_path, os.path.dirname(file_path))
+        copied_paths = [shutil.copy(cls_path, os.path.dirname(file_path))]
+        if theme_obj.photo_path:
+            copied_paths.append(shutil.copy(
+                theme_obj.photo_path, os.path.dirname(file_path)
+            ))
+
+        def compile_doc(doc):
+            if optimize:
+                doc.preamble.append(
+                    pylatex.NoEscape(resumpy.postprocess.PDFTEX_COMPRESSION)
+                )
+            if deterministic:
+                doc.preamble.append(
+                    pylatex.NoEscape(resumpy.postprocess.PDFTEX_DETERMINISTIC)
+                )
+            doc.generate_pdf(
+                file_path, clean=max_pages is None, clean_tex=not keep_tex,
+                compiler=compiler, compiler_args=compiler_args
+            )
+            if max_pages is not None:
+                pages = resumpy.fit.get_page_count(file_path)
+                resumpy.fit.clean_latex_files(file_path)
+                return pages
 
-        # Get doc object
-        doc = theme_obj.format(self.model)
-        doc.generate_pdf(file_path, clean_tex=not keep_tex)
+        environ = {}
+        if deterministic:
+            environ = {
+                'SOURCE_DATE_EPOCH': str(calendar.timegm(
+                    reference_date.timetuple()
+                )),
+                'FORCE_SOURCE_DATE': '1'
+            }
+        with resumpy.utils.set_environ(environ):
+            if max_pages is None:
+                compile_doc(doc)
+            else:
+                _, _, pages, changes = resumpy.fit.fit(
+                    model, theme_obj, max_pages, compile_doc, drop_order
+                )
+                for change in changes:
+                    self.logger.info('To fit in {} pages: {}'.format(
+                        max_pages, change
+                    ))
+                if pages is not None and pages > max_pages:
+                    self.logger.warning(
+                        'The CV does not fit in {} pages even after trimming '
+                        'it ({} pages)'.format(max_pages, pages)
+                    )
+        if optimize:
+            resumpy.postprocess.optimize_pdf(
+                file_path + '.pdf', self.logger, deterministic
+            )
 
         # Remove .tex file if specified
         if not keep_tex:
-            os.remove(os.path.join(
-                os.path.dirname(file_path), os.path.basename(cls_path)
-            ))
+            for copied_path in copied_paths:
+                os.remove(copied_path)
 
     def __eq__(self, other):
-        return self.model.dump() == other.model.dump()
+        return self.model == other.model
+
+    def __hash__(self):
+        return hash(self.model)
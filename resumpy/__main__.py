@@ -1,4 +1,11 @@
 import argparse
+import datetime
+import json
+import resumpy.batch
+import resumpy.doctor
+import resumpy.fit
+import resumpy.scheduler
+import resumpy.server
 import resumpy.themes
 import logging
 import os
@@ -7,8 +14,23 @@ import random
 # Create the ArgumentParse and parse the arguments inside `args`
 parser = argparse.ArgumentParser(description='Run Resumpy')
 parser.add_argument(
-    '--cv-file', required=True,
-    help='Relative or absolute path to the raw .json or .yaml resume file'
+    'command', nargs='?',
+    choices=['render', 'batch', 'serve', 'client', 'metrics', 'doctor'],
+    default='render',
+    help='Generate a resume, generate several resumes in a single LaTeX '
+         'compilation, start a render server, send the resume to a running '
+         'server, print the metrics of a running server or check the TeX '
+         'installation'
+)
+parser.add_argument(
+    '--cv-file', required=False, nargs='+',
+    help='Relative or absolute path to the raw .json or .yaml resume file, or '
+         'to several of them with the batch command'
+)
+parser.add_argument(
+    '--overlay', required=False,
+    help='Relative or absolute path to a .json or .yaml merge patch applied '
+         'on top of --cv-file'
 )
 parser.add_argument(
     '--theme', choices=['sitges'],
@@ -21,7 +43,53 @@ parser.add_argument(
     '--keep-tex', action='store_true',
     help='Keep LaTeX files used to generate the resume'
 )
+parser.add_argument(
+    '--optimize-pdf', action='store_true',
+    help='Post-process the generated PDF to reduce its size'
+)
+parser.add_argument(
+    '--lint', choices=['reject', 'fix', 'off'], default='reject',
+    help='Reject, fix or ignore content that would break the compilation'
+)
+parser.add_argument(
+    '--deterministic', action='store_true',
+    help='Generate the same PDF bytes on every run'
+)
+parser.add_argument(
+    '--reference-date', type=datetime.date.fromisoformat,
+    help='Date used to compute ages, in YYYY-MM-DD format'
+)
+parser.add_argument(
+    '--max-pages', type=int,
+    help='Condense and trim the resume until it fits in this number of pages'
+)
+parser.add_argument(
+    '--drop-order', nargs='+', choices=resumpy.fit.DROP_ORDER,
+    default=resumpy.fit.DROP_ORDER,
+    help='Optional sections which can be dropped by --max-pages, in order'
+)
+parser.add_argument(
+    '--photo-dpi', type=int,
+    help='Resolution of the photo, in dots per inch. Defaults to the one of '
+         'the theme'
+)
+parser.add_argument(
+    '--socket',
+    help='Path of the Unix domain socket of the render server. Defaults to '
+         'a folder private to the current user'
+)
+parser.add_argument(
+    '--priority', choices=resumpy.scheduler.PRIORITIES,
+    default='interactive', help='Priority of the resume sent to the server'
+)
+parser.add_argument(
+    '--tenant', help='Owner of the resume sent to the server'
+)
 args = parser.parse_args()
+if args.command in ['render', 'client', 'batch'] and args.cv_file is None:
+    parser.error('the following arguments are required: --cv-file')
+if args.command in ['render', 'client'] and len(args.cv_file) > 1:
+    parser.error('use the batch command to generate several resumes')
 
 # Create a logging.Logger object to be used in the execution
 logging.basicConfig(
@@ -39,7 +107,83 @@ file_name = args.filename if args.filename \
     else '{}-{}'.format(args.theme, random.randint(1, 1E6))
 file_path = os.path.join(os.getcwd(), '{}'.format(file_name))
 
+# Check that the TeX installation can compile --theme, or every theme
+if args.command == 'doctor':
+    report = resumpy.doctor.get_report(refresh=True)
+    print(resumpy.doctor.format_report(report))
+    problems = [
+        problem for theme_name in
+        ([args.theme] if args.theme else resumpy.themes.__themes_names__)
+        for problem in resumpy.doctor.get_problems(report, theme_name)
+    ]
+    for problem in problems:
+        logger.error(problem)
+    exit(1 if problems else 0)
+
+# Serve requests until interrupted, or delegate the generation to a server
+if args.command in ['serve', 'metrics', 'client']:
+    socket_path = args.socket or resumpy.server.get_default_socket_path()
+if args.command == 'serve':
+    resumpy.server.serve(socket_path, cv_schema_path, logger)
+    exit()
+if args.command == 'metrics':
+    response = resumpy.server.send_request(socket_path, {'command': 'metrics'})
+    print(json.dumps(response['metrics'], indent=2))
+    exit()
+if args.command == 'client':
+    response = resumpy.server.send_request(socket_path, {
+        'command': 'render',
+        'priority': args.priority,
+        'tenant': args.tenant,
+        'cv_file': os.path.abspath(args.cv_file[0]),
+        'overlay': os.path.abspath(args.overlay) if args.overlay else None,
+        'theme': args.theme,
+        'file_path': file_path,
+        'keep_tex': args.keep_tex,
+        'optimize': args.optimize_pdf,
+        'lint': args.lint if args.lint != 'off' else None,
+        'deterministic': args.deterministic,
+        'reference_date': args.reference_date.isoformat()
+        if args.reference_date else None,
+        'max_pages': args.max_pages,
+        'drop_order': args.drop_order,
+        'photo_dpi': args.photo_dpi
+    })
+    if response['status'] != 'ok':
+        logger.error(response['error'])
+        exit(1)
+    logger.info('Generated {}'.format(response['file_path']))
+    exit()
+
+# Generate every --cv-file in a single compilation, named after its file
+if args.command == 'batch':
+    cvs = []
+    for cv_file_path in args.cv_file:
+        cvs.append(resumpy.CV(logger))
+        cvs[-1].load(cv_file_path, cv_schema_path)
+        if args.overlay:
+            cvs[-1] = cvs[-1].apply_overlay(args.overlay, cv_schema_path)
+    pdf_paths = resumpy.batch.generate_batch(
+        cvs, args.theme, [os.path.join(os.getcwd(), '{}{}'.format(
+            args.filename + '-' if args.filename else '',
+            os.path.splitext(os.path.basename(cv_file_path))[0]
+        )) for cv_file_path in args.cv_file], logger, args.optimize_pdf,
+        lint=args.lint if args.lint != 'off' else None,
+        reference_date=args.reference_date, deterministic=args.deterministic,
+        max_pages=args.max_pages, drop_order=args.drop_order,
+        photo_dpi=args.photo_dpi
+    )
+    exit(1 if None in pdf_paths else 0)
+
 # Create a new CV object with the data provided in the --cv-file argument
 cv = resumpy.CV(logger)
-cv.load(args.cv_file, cv_schema_path)
-cv.generate(args.theme, file_path, args.keep_tex)
+cv.load(args.cv_file[0], cv_schema_path)
+if args.overlay:
+    cv = cv.apply_overlay(args.overlay, cv_schema_path)
+cv.generate(
+    args.theme, file_path, args.keep_tex, args.optimize_pdf,
+    lint=args.lint if args.lint != 'off' else None,
+    deterministic=args.deterministic, reference_date=args.reference_date,
+    max_pages=args.max_pages, drop_order=args.drop_order,
+    photo_dpi=args.photo_dpi
+)
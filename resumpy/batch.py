@@ -0,0 +1,253 @@
+import resumpy.doctor
+import resumpy.fit
+import resumpy.postprocess
+import resumpy.theme
+import os
+import pylatex
+import re
+import shutil
+import subprocess
+import tempfile
+
+try:
+    import pikepdf
+except ImportError:
+    pikepdf = None
+
+# Message written to the LaTeX log after the last page of each CV, followed by
+# the number of the page following it
+PAGES_MARKER = 'RESUMPY-BATCH-PAGES'
+
+PAGES_MARKER_REGEX = re.compile(PAGES_MARKER + r' (\d+)')
+
+
+def generate_batch(cvs, theme_name, file_paths, logger, optimize=False,
+                   compiler=None, compiler_args=None, lint='reject',
+                   reference_date=None, deterministic=False, max_pages=None,
+                   drop_order=resumpy.fit.DROP_ORDER, photo_dpi=None):
+    """Generates several CVs with a single LaTeX compilation.
+
+    The CVs are typeset one after the other in a single document, which is
+    compiled once and then split into one PDF file per CV, so that the
+    start-up of LaTeX and the loading of the class and its packages are paid
+    once per batch instead of once per CV. If the PDF files can not be split,
+    because neither pikepdf nor qpdf are installed, or if the batch does not
+    compile, the CVs are generated one by one. They are also generated one by
+    one if `deterministic` or `max_pages` are given, as both need a separate
+    compilation of each CV.
+
+    CVs which fail to generate are logged and skipped, without stopping the
+    rest of the batch.
+
+    Args:
+        cvs (list of resumpy.CV): CVs to generate.
+        theme_name (str): name of the theme to use.
+        file_paths (list of str): paths where each CV should be stored,
+            without extension.
+        logger (logging.Logger): logger used during the generation.
+        optimize (bool): whether to reduce the size of the generated files.
+        compiler (str): LaTeX compiler to use.
+        compiler_args (list of str): extra arguments of `compiler`.
+        lint (str): what to do with content that would break the LaTeX
+            compilation. See `resumpy.CV.generate`.
+        reference_date (datetime.date): date used to compute ages.
+        deterministic (bool): whether to produce the same PDF bytes on every
+            run. See `resumpy.CV.generate`.
+        max_pages (int): maximum number of pages of each CV. See
+            `resumpy.CV.generate`.
+        drop_order (list of str): optional sections which can be dropped to
+            fit each CV in `max_pages`, in order.
+        photo_dpi (int): resolution of the photos. Defaults to the
+            `photo_dpi` of the theme.
+
+    Returns:
+        list of str: path of the PDF file of each CV, or `None` for the CVs
+        which failed to generate.
+
+    Raises:
+        resumpy.doctor.PreflightError: if the TeX installation can not compile
+            the theme.
+    """
+    resumpy.doctor.preflight(theme_name, compiler)
+    generate_kwargs = {
+        'optimize': optimize, 'compiler': compiler,
+        'compiler_args': compiler_args, 'lint': lint,
+        'reference_date': reference_date, 'deterministic': deterministic,
+        'max_pages': max_pages, 'drop_order': drop_order,
+        'photo_dpi': photo_dpi
+    }
+    if deterministic or max_pages is not None:
+        return _generate_one_by_one(
+            cvs, theme_name, file_paths, logger, **generate_kwargs
+        )
+    if resumpy.postprocess.get_backend() is None:
+        logger.warning('Install pikepdf or qpdf to generate CVs in a single '
+                       'compilation. Generating them one by one.')
+        return _generate_one_by_one(
+            cvs, theme_name, file_paths, logger, **generate_kwargs
+        )
+
+    theme_obj = resumpy.theme.Theme.create_theme_by_name(theme_name, logger)
+    theme_obj.reference_date = reference_date
+    if photo_dpi is not None:
+        theme_obj.photo_dpi = photo_dpi
+    doc, errors, photo_paths = format_batch(cvs, theme_obj, lint)
+    for i, error in sorted(errors.items()):
+        logger.error('Could not generate {}: {}: {}'.format(
+            file_paths[i], type(error).__name__, error
+        ))
+    formatted = [i for i in range(len(cvs)) if i not in errors]
+    pdf_paths = [None] * len(cvs)
+    if not formatted:
+        return pdf_paths
+    if optimize:
+        doc.preamble.append(
+            pylatex.NoEscape(resumpy.postprocess.PDFTEX_COMPRESSION)
+        )
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        batch_path = os.path.join(tmp_dir, 'batch')
+        shutil.copy(os.path.join(
+            os.path.dirname(__file__), 'themes', 'cls', theme_name + '.cls'
+        ), tmp_dir)
+        for photo_path in photo_paths:
+            shutil.copy(photo_path, tmp_dir)
+        try:
+            doc.generate_pdf(
+                batch_path, clean=False, compiler=compiler,
+                compiler_args=compiler_args
+            )
+        except subprocess.CalledProcessError:
+            page_counts = []
+        else:
+            page_counts = get_page_counts(batch_path)
+        if len(page_counts) != len(formatted):
+            logger.warning('The batch could not be compiled. Generating the '
+                           'CVs one by one.')
+            formatted_paths = _generate_one_by_one(
+                [cvs[i] for i in formatted], theme_name,
+                [file_paths[i] for i in formatted], logger, **generate_kwargs
+            )
+        else:
+            formatted_paths = [file_paths[i] + '.pdf' for i in formatted]
+            split_pdf(
+                batch_path + '.pdf', page_counts, formatted_paths, optimize
+            )
+            logger.info('Generated {} CVs ({} pages) in a single '
+                        'compilation'.format(len(formatted), sum(page_counts)))
+    for i, pdf_path in zip(formatted, formatted_paths):
+        pdf_paths[i] = pdf_path
+    return pdf_paths
+
+
+def format_batch(cvs, theme_obj, lint='reject'):
+    """Formats several CVs as consecutive parts of a single document.
+
+    Each CV starts on a new page with the page counter reset, and the
+    `reset_macros` of the theme are reset after each CV, so that the next one
+    can define them again. The number of pages of each CV is written in the
+    LaTeX log. See `get_page_counts`. CVs which can not be formatted, for
+    instance because their content would break the compilation, are left out
+    of the document.
+
+    Args:
+        cvs (list of resumpy.CV): CVs to format.
+        theme_obj (resumpy.theme.Theme): theme used to format the CVs.
+        lint (str): what to do with content that would break the LaTeX
+            compilation. See `resumpy.CV.generate`.
+
+    Returns:
+        tuple: the `pylatex.Document` containing the CVs, a dict with the
+        exception raised by each CV left out of it, by index, and the list of
+        the photos which have to be copied to the folder of the document.
+    """
+    doc = pylatex.Document(documentclass=theme_obj.theme_name)
+    doc.preamble.append(pylatex.NoEscape('\\hypersetup{pageanchor=false}'))
+    reset = '\n'.join(['\\makeatletter'] + [
+        '\\let\\{}\\relax'.format(macro) for macro in theme_obj.reset_macros
+    ] + ['\\makeatother'])
+    errors, photo_paths = {}, []
+    for i, cv in enumerate(cvs):
+        try:
+            _, cv_doc = cv.format(theme_obj, lint)
+        except (Exception, SystemExit) as e:
+            errors[i] = e
+            continue
+        if theme_obj.photo_path and theme_obj.photo_path not in photo_paths:
+            photo_paths.append(theme_obj.photo_path)
+        for preamble_item in cv_doc.preamble:
+            if preamble_item not in doc.preamble:
+                doc.preamble.append(preamble_item)
+        doc.extend(cv_doc.data)
+        doc.append(pylatex.NoEscape(
+            '\\clearpage\n\\typeout{{{} \\arabic{{page}}}}\n'
+            '\\setcounter{{page}}{{1}}\n{}'.format(PAGES_MARKER, reset)
+        ))
+    return doc, errors, photo_paths
+
+
+def get_page_counts(file_path):
+    """Reads the number of pages of each CV of a compiled batch from its
+    LaTeX log.
+
+    Args:
+        file_path (str): path of the batch document, without extension.
+
+    Returns:
+        list of int: number of pages of each CV.
+    """
+    try:
+        with open(file_path + '.log', 'rb') as log_file:
+            log = log_file.read().decode('utf-8', 'replace')
+    except OSError:
+        return []
+    return [int(n) - 1 for n in PAGES_MARKER_REGEX.findall(log)]
+
+
+def split_pdf(pdf_path, page_counts, output_paths, optimize=False):
+    """Splits a PDF file into consecutive ranges of pages.
+
+    Args:
+        pdf_path (str): path to the PDF file to split.
+        page_counts (list of int): number of pages of each part.
+        output_paths (list of str): path of the PDF file of each part.
+        optimize (bool): whether to reduce the size of the parts. See
+            `resumpy.postprocess.optimize_pdf`.
+    """
+    page_start = 0
+    if pikepdf is not None:
+        with pikepdf.open(pdf_path) as pdf:
+            for page_count, output_path in zip(page_counts, output_paths):
+                with pikepdf.new() as output:
+                    output.pages.extend(
+                        pdf.pages[page_start:page_start + page_count]
+                    )
+                    if optimize:
+                        resumpy.postprocess.save_optimized(output, output_path)
+                    else:
+                        output.save(output_path)
+                page_start += page_count
+        return
+    for page_count, output_path in zip(page_counts, output_paths):
+        resumpy.postprocess.run_qpdf([
+            '--empty', '--pages', pdf_path,
+            '{}-{}'.format(page_start + 1, page_start + page_count), '--'
+        ] + ([
+            '--linearize', '--object-streams=generate',
+            '--compress-streams=y', '--recompress-flate'
+        ] if optimize else []) + [output_path])
+        page_start += page_count
+
+
+def _generate_one_by_one(cvs, theme_name, file_paths, logger, **kwargs):
+    pdf_paths = []
+    for cv, file_path in zip(cvs, file_paths):
+        try:
+            cv.generate(theme_name, file_path, False, **kwargs)
+        except (Exception, SystemExit) as e:
+            logger.error('Could not generate {}: {}: {}'.format(
+                file_path, type(e).__name__, e
+            ))
+            pdf_paths.append(None)
+        else:
+            pdf_paths.append(file_path + '.pdf')
+    return pdf_paths
@@ -0,0 +1,204 @@
+import resumpy.model
+import numpy as np
+import re
+import zlib
+
+# Number of consecutive words of each shingle
+SHINGLE_SIZE = 3
+
+
+class DuplicateDetector:
+    """Streaming detector of exact and near-duplicate models.
+
+    Exact duplicates are found by their `fingerprint`. Near duplicates are
+    found by estimating the Jaccard similarity of the word shingles of their
+    text fields with MinHash signatures, which are indexed with locality
+    sensitive hashing (LSH): each signature is split into bands, and only the
+    models sharing at least one band with the query are compared. Both the
+    memory and the time needed to add a model are independent of the size of
+    the corpus, except for the candidates which are actually similar.
+
+    Attributes:
+        threshold (float): minimum Jaccard similarity of near duplicates.
+        num_perm (int): number of permutations of the MinHash signatures.
+        bands (int): number of LSH bands of each signature.
+    """
+    threshold = None
+    num_perm = None
+    bands = None
+
+    def __init__(self, threshold=0.8, num_perm=128, seed=0):
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = DuplicateDetector.get_bands(threshold, num_perm)
+        random_state = np.random.RandomState(seed)
+        self._a = random_state.randint(
+            0, 2 ** 63, size=num_perm, dtype=np.uint64
+        ) * np.uint64(2) + np.uint64(1)
+        self._b = random_state.randint(
+            0, 2 ** 63, size=num_perm, dtype=np.uint64
+        )
+        self._fingerprints = {}
+        self._doc_ids = []
+        self._signatures = np.empty((1024, num_perm), dtype=np.uint64)
+        self._buckets = [{} for _ in range(self.bands)]
+
+    @staticmethod
+    def get_bands(threshold, num_perm):
+        """Returns the number of LSH bands whose detection threshold is the
+        closest to `threshold`.
+
+        With `b` bands of `r` rows, two signatures with a Jaccard similarity
+        `s` share at least one band with probability `1 - (1 - s^r)^b`, which
+        grows steeply around `(1 / b)^(1 / r)`.
+
+        Args:
+            threshold (float): minimum Jaccard similarity to detect.
+            num_perm (int): number of permutations of the signatures.
+
+        Returns:
+            int: number of bands, which divides `num_perm`.
+        """
+        return min(
+            (b for b in range(1, num_perm + 1) if num_perm % b == 0),
+            key=lambda b: abs((1 / b) ** (b / num_perm) - threshold)
+        )
+
+    def signature(self, model):
+        """Computes the MinHash signature of the text fields of `model`.
+
+        Each permutation of the 32-bit hashes of the shingles is approximated
+        with a multiply-shift hash, `(a * x + b) >> 32` modulo `2^64`, which
+        avoids the much slower modulo of a prime.
+
+        Args:
+            model (resumpy.model.ItemBase): model to sign.
+
+        Returns:
+            np.ndarray: `num_perm` unsigned integers.
+        """
+        hashes = np.array([
+            zlib.crc32(shingle.encode('utf-8'))
+            for shingle in get_shingles(model)
+        ] or [0], dtype=np.uint64)
+        permuted = (np.outer(hashes, self._a) + self._b) >> np.uint64(32)
+        return permuted.min(axis=0)
+
+    def query(self, model):
+        """Finds the models of the detector which are duplicates of `model`.
+
+        Args:
+            model (resumpy.model.ItemBase): model to look up.
+
+        Returns:
+            list of (str, float): identifiers of the duplicates and their
+            estimated similarity, from the most to the least similar. Exact
+            duplicates have a similarity of 1.
+        """
+        return self._query(model.fingerprint(), self.signature(model))
+
+    def add(self, doc_id, model):
+        """Finds the duplicates of `model` and then adds it to the detector.
+
+        Args:
+            doc_id (str): identifier of the model.
+            model (resumpy.model.ItemBase): model to add.
+
+        Returns:
+            list of (str, float): duplicates of `model`. See `query`.
+        """
+        fingerprint, signature = model.fingerprint(), self.signature(model)
+        duplicates = self._query(fingerprint, signature)
+        doc_number = len(self._doc_ids)
+        if doc_number == len(self._signatures):
+            self._signatures = np.concatenate([
+                self._signatures, np.empty_like(self._signatures)
+            ])
+        self._doc_ids.append(doc_id)
+        self._signatures[doc_number] = signature
+        self._fingerprints.setdefault(fingerprint, []).append(doc_number)
+        for band, band_key in enumerate(self._get_band_keys(signature)):
+            self._buckets[band].setdefault(band_key, []).append(doc_number)
+        return duplicates
+
+    def __len__(self):
+        return len(self._doc_ids)
+
+    def _query(self, fingerprint, signature):
+        exact = set(self._fingerprints.get(fingerprint, []))
+        candidates = set()
+        for band, band_key in enumerate(self._get_band_keys(signature)):
+            candidates.update(self._buckets[band].get(band_key, []))
+        candidates = np.array(sorted(candidates - exact), dtype=np.int64)
+        similarities = (
+            self._signatures[candidates] == signature
+        ).mean(axis=1)
+        duplicates = [(self._doc_ids[n], 1.0) for n in sorted(exact)] + [
+            (self._doc_ids[n], float(similarity)) for n, similarity in
+            zip(candidates, similarities) if similarity >= self.threshold
+        ]
+        return sorted(duplicates, key=lambda duplicate: -duplicate[1])
+
+    def _get_band_keys(self, signature):
+        return [band.tobytes() for band in np.split(signature, self.bands)]
+
+
+def find_duplicates(models, threshold=0.8, num_perm=128):
+    """Finds the duplicates of each model of a stream of models.
+
+    Args:
+        models (iterable of (str, resumpy.model.Model)): pairs containing
+            the identifier of each document and its model.
+        threshold (float): minimum Jaccard similarity of near duplicates.
+        num_perm (int): number of permutations of the MinHash signatures.
+
+    Yields:
+        tuple: the identifier of each model with duplicates among the
+        previous ones, and the list of its duplicates. See
+        `DuplicateDetector.query`.
+    """
+    detector = DuplicateDetector(threshold, num_perm)
+    for doc_id, model in models:
+        duplicates = detector.add(doc_id, model)
+        if duplicates:
+            yield doc_id, duplicates
+
+
+def get_shingles(model):
+    """Returns the set of shingles of `SHINGLE_SIZE` consecutive words of the
+    text fields of `model`.
+
+    Text fields shorter than `SHINGLE_SIZE` words are used as a single
+    shingle.
+
+    Args:
+        model (resumpy.model.ItemBase): model to split into shingles.
+
+    Returns:
+        set of str: shingles of the text fields of `model`.
+    """
+    shingles = set()
+    for text in _iter_text(model):
+        words = re.findall(r'\w+', text.casefold())
+        shingles.update(
+            ' '.join(words[i:i + SHINGLE_SIZE])
+            for i in range(max(len(words) - SHINGLE_SIZE + 1, 1))
+        )
+    shingles.discard('')
+    return shingles
+
+
+def _iter_text(value):
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, list):
+        for item in value:
+            yield from _iter_text(item)
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _iter_text(item)
+    elif isinstance(value, resumpy.model.ItemBase):
+        for attr in dir(value):
+            field = getattr(value, attr)
+            if isinstance(field, resumpy.model.Field):
+                yield from _iter_text(field.value)
@@ -0,0 +1,289 @@
+import resumpy.themes
+import resumpy.utils
+import functools
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import time
+
+# LaTeX engines detected in the TeX installation. PyLaTeX compiles with
+# `latexmk` if installed and falls back to `pdflatex` otherwise
+ENGINES = ('pdflatex', 'latexmk', 'xelatex', 'lualatex')
+
+# Environment variables which change where kpathsea finds the TeX files
+TEX_ENVIRON = ('TEXINPUTS', 'TEXMFHOME', 'TEXMFLOCAL', 'TEXMFCNF')
+
+# Version of the report, part of the cache keys so that changes in its format
+# invalidate the reports stored by previous versions
+REPORT_VERSION = 1
+
+# Seconds during which the last report is reused without checking whether the
+# TeX installation has changed
+REPORT_TTL = 60
+
+REQUIREMENT_REGEX = re.compile(
+    r'^[ \t]*\\(RequirePackage|usepackage|LoadClass)(?:\[[^\]]*\])?'
+    r'\{([^}]+)\}', re.MULTILINE
+)
+
+_reports = {}
+_last_report = None
+
+
+class PreflightError(Exception):
+    """Raised when the TeX installation can not compile a theme."""
+    problems = None
+
+    def __init__(self, problems):
+        super(PreflightError, self).__init__('\n'.join(problems + [
+            'Run `python -m resumpy doctor` for a full report.'
+        ]))
+        self.problems = problems
+
+
+def preflight(theme_name, compiler=None):
+    """Checks that the TeX installation can compile `theme_name` with
+    `compiler`, without running LaTeX.
+
+    The capabilities of the installation are read from the cached report
+    returned by `get_report`, so checking a job does not run any process and
+    usually does not touch the file system.
+
+    Args:
+        theme_name (str): name of the theme to compile.
+        compiler (str): LaTeX compiler to use. See `resumpy.CV.generate`.
+
+    Raises:
+        PreflightError: if the theme can not be compiled.
+    """
+    problems = get_problems(get_report(), theme_name, compiler)
+    if problems:
+        raise PreflightError(problems)
+
+
+def get_report(refresh=False):
+    """Returns the capabilities of the TeX installation.
+
+    Reports are cached in the cache of ResumPY, indexed by the paths, sizes
+    and modification times of the engines and of `kpsewhich`, the variables
+    of `TEX_ENVIRON` and the requirements of the themes, so that installing
+    or upgrading TeX Live or editing a theme produces a new report. The last
+    report is also kept in memory, and reused without checking the
+    installation again for `REPORT_TTL` seconds. If the cache folder is not
+    writable, reports are only kept in memory.
+
+    Args:
+        refresh (bool): whether to ignore the cached reports.
+
+    Returns:
+        dict: `engines` and `kpsewhich`, with the path and the version of
+        each executable or `None` if it is not installed, and `themes`, with
+        the path of each file required by each theme or `None` if it is not
+        found. The path of the files is `None` as well when `kpsewhich` is
+        not installed.
+    """
+    global _last_report
+    checked_at = time.monotonic()
+    if not refresh and _last_report is not None and \
+            checked_at - _last_report[0] < REPORT_TTL:
+        return _last_report[1]
+
+    requirements = {
+        theme_name: list(get_requirements(theme_name))
+        for theme_name in resumpy.themes.__themes_names__
+    }
+    executables = {
+        name: shutil.which(name) for name in ENGINES + ('kpsewhich',)
+    }
+    key = _get_installation_key(executables, requirements)
+    report = None if refresh else (_reports.get(key) or _read_report(key))
+    if report is None:
+        report = _build_report(executables, requirements)
+        _write_report(key, report)
+    _reports[key] = report
+    _last_report = (checked_at, report)
+    return report
+
+
+@functools.lru_cache(maxsize=None)
+def get_requirements(theme_name):
+    """Returns the files loaded by the `.cls` file of a theme.
+
+    The `.cls` file is only read once per process.
+
+    Args:
+        theme_name (str): name of the theme.
+
+    Returns:
+        tuple of str: name of the classes and packages loaded by the theme,
+        with their extension, in order of appearance.
+    """
+    cls_path = os.path.join(
+        os.path.dirname(__file__), 'themes', 'cls', theme_name + '.cls'
+    )
+    with open(cls_path) as cls_file:
+        cls = cls_file.read()
+    requirements = []
+    for command, names in REQUIREMENT_REGEX.findall(cls):
+        extension = '.cls' if command == 'LoadClass' else '.sty'
+        for name in names.split(','):
+            if name.strip() + extension not in requirements:
+                requirements.append(name.strip() + extension)
+    return tuple(requirements)
+
+
+def get_problems(report, theme_name, compiler=None):
+    """Finds the problems which prevent compiling a theme.
+
+    Only the existence of custom compilers, which are not one of `ENGINES`,
+    is checked.
+
+    Args:
+        report (dict): capabilities of the TeX installation. See
+            `get_report`.
+        theme_name (str): name of the theme to compile.
+        compiler (str): LaTeX compiler to use. See `resumpy.CV.generate`.
+
+    Returns:
+        list of str: description of each problem.
+    """
+    if theme_name not in report['themes']:
+        return ['Theme {!r} does not exist'.format(theme_name)]
+    problems = []
+    engine = os.path.basename(compiler) if compiler is not None else None
+    if compiler is None:
+        if report['engines']['latexmk'] is None and \
+                report['engines']['pdflatex'] is None:
+            problems.append('Neither latexmk nor pdflatex are installed')
+    elif engine not in ENGINES:
+        if shutil.which(compiler) is None:
+            problems.append('{} is not installed'.format(compiler))
+        return problems
+    elif report['engines'][engine] is None and shutil.which(compiler) is None:
+        problems.append('{} is not installed'.format(compiler))
+    if report['kpsewhich'] is None:
+        return problems
+    missing_files = [
+        file_name for file_name, file_path
+        in report['themes'][theme_name].items() if file_path is None
+    ]
+    if missing_files:
+        problems.append('Missing LaTeX files required by the {} theme: {}'
+                        .format(theme_name, ', '.join(missing_files)))
+    return problems
+
+
+def format_report(report):
+    """Formats a report as a human-readable text.
+
+    Args:
+        report (dict): capabilities of the TeX installation. See
+            `get_report`.
+
+    Returns:
+        str: formatted report.
+    """
+    lines = ['TeX installation:']
+    for name, executable in sorted(report['engines'].items()) + [
+        ('kpsewhich', report['kpsewhich'])
+    ]:
+        lines.append('  {:<12}{}'.format(name, '{} ({})'.format(
+            executable['path'], executable['version']
+        ) if executable else 'not found'))
+    for theme_name, files in sorted(report['themes'].items()):
+        lines.append('Theme {}:'.format(theme_name))
+        for file_name, file_path in files.items():
+            lines.append('  {:<16}{}'.format(file_name, file_path or (
+                'MISSING' if report['kpsewhich'] else 'unknown'
+            )))
+    return '\n'.join(lines)
+
+
+def _build_report(executables, requirements):
+    report = {
+        'engines': {
+            name: _get_executable(executables[name]) for name in ENGINES
+        },
+        'kpsewhich': _get_executable(executables['kpsewhich']),
+        'themes': {}
+    }
+    files = _find_files(executables['kpsewhich'], sorted(
+        set(f for theme_files in requirements.values() for f in theme_files)
+    ))
+    for theme_name, theme_files in requirements.items():
+        report['themes'][theme_name] = {f: files.get(f) for f in theme_files}
+    return report
+
+
+def _read_report(key):
+    try:
+        report_path = os.path.join(
+            resumpy.utils.get_cache_dir('doctor'), key + '.json'
+        )
+        with open(report_path) as report_file:
+            return json.load(report_file)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_report(key, report):
+    """Stores `report` in the cache, writing to a temporary file first so
+    that concurrent workers never read a partially written report."""
+    try:
+        report_path = os.path.join(
+            resumpy.utils.get_cache_dir('doctor'), key + '.json'
+        )
+        tmp_path = '{}.{}.tmp'.format(report_path, os.getpid())
+        with open(tmp_path, 'w') as report_file:
+            json.dump(report, report_file, indent=2)
+        os.replace(tmp_path, report_path)
+    except OSError:
+        pass
+
+
+def _get_installation_key(executables, requirements):
+    installation = {'version': REPORT_VERSION, 'requirements': requirements}
+    for name, path in executables.items():
+        if path is not None:
+            stat = os.stat(path)
+            path = [os.path.realpath(path), stat.st_size, stat.st_mtime_ns]
+        installation[name] = path
+    for variable in TEX_ENVIRON:
+        installation[variable] = os.environ.get(variable)
+    return hashlib.sha256(
+        json.dumps(installation, sort_keys=True).encode('utf-8')
+    ).hexdigest()
+
+
+def _get_executable(path):
+    if path is None:
+        return None
+    try:
+        output = subprocess.run(
+            [path, '--version'], stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT, timeout=30
+        ).stdout.decode('utf-8', 'replace')
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    version = next(
+        (line.strip() for line in output.split('\n') if line.strip()), ''
+    )
+    return {'path': path, 'version': version}
+
+
+def _find_files(kpsewhich_path, file_names):
+    """Returns the paths of the TeX files found by `kpsewhich`, looking all of
+    them up in a single call."""
+    if kpsewhich_path is None or not file_names:
+        return {}
+    output = subprocess.run(
+        [kpsewhich_path] + file_names, stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL, timeout=60
+    ).stdout.decode('utf-8', 'replace')
+    return {
+        os.path.basename(file_path): file_path
+        for file_path in output.split('\n') if file_path.strip()
+    }
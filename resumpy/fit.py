@@ -0,0 +1,161 @@
+import resumpy.model
+import copy
+import os
+import re
+
+# Optional content dropped, in order, when a CV does not fit in the maximum
+# number of pages. `hobbies` refers to the field of the basic information
+DROP_ORDER = ('hobbies', 'projects', 'courses', 'awards', 'publications')
+
+# Factor applied to the vertical skips of the theme in condensed mode
+CONDENSED_SPACING = 0.5
+
+# Maximum number of bullets of each list, tried in order before dropping
+# sections
+MAX_BULLETS = (3, 2, 1)
+
+# Fraction of the page budget that estimations must leave free, as they do
+# not account for page breaks
+ESTIMATE_MARGIN = 0.95
+
+PAGES_REGEX = re.compile(r'Output written on .*?\((\d+) pages?')
+
+
+def get_variants(model, drop_order=DROP_ORDER):
+    """Returns the trimmed versions of `model` tried to fit it in fewer
+    pages, from the least to the most trimmed.
+
+    The first variant is `model` itself, the second one condenses the
+    spacing of the theme, the next ones cap the number of bullets of the
+    descriptions to each value of `MAX_BULLETS` and the last ones drop the
+    optional sections of `drop_order`, one by one. Every variant includes the
+    changes of the previous ones.
+
+    Args:
+        model (resumpy.model.Model): model to trim.
+        drop_order (list of str): optional sections to drop, in order.
+
+    Returns:
+        list of tuple: a `(model, spacing, changes)` tuple for each variant,
+        where `spacing` is the factor applied to the vertical skips of the
+        theme and `changes` is the list of changes made to `model`.
+    """
+    model_raw = model.dump()
+    variants = [(model, 1, []), (model, CONDENSED_SPACING, [
+        'condensed spacing'
+    ])]
+    changes = variants[-1][2]
+    for max_bullets in MAX_BULLETS:
+        trimmed_raw, bullet_changes = _trim_bullets(
+            copy.deepcopy(model.dump()), max_bullets
+        )
+        if bullet_changes:
+            model_raw = trimmed_raw
+            changes = variants[1][2] + bullet_changes
+            variants.append((
+                resumpy.model.Model(model_raw), CONDENSED_SPACING, changes
+            ))
+    for section in drop_order:
+        if section not in DROP_ORDER:
+            raise ValueError('{!r} is not an optional section'.format(section))
+        model_raw = copy.deepcopy(model_raw)
+        section_raw = model_raw['basic'] if section == 'hobbies' \
+            else model_raw
+        if section_raw.pop(section, None):
+            changes = changes + ['dropped {}'.format(section)]
+            variants.append((
+                resumpy.model.Model(model_raw), CONDENSED_SPACING, changes
+            ))
+    return variants
+
+
+def fit(model, theme_obj, max_pages, compile_doc, drop_order=DROP_ORDER):
+    """Trims `model` until its document fits in `max_pages` pages.
+
+    The number of pages of each variant returned by `get_variants` is
+    estimated with `theme_obj.estimate_pages`, and the least trimmed variant
+    which is expected to fit is compiled. If it does not fit, the estimations
+    are scaled by the error measured in that compilation and the next
+    candidate is compiled, so that usually one or two compilations are
+    needed.
+
+    Args:
+        model (resumpy.model.Model): model to fit.
+        theme_obj (resumpy.theme.Theme): theme used to format the document.
+        max_pages (int): maximum number of pages of the document.
+        compile_doc (callable): function compiling a `pylatex.Document` and
+            returning its number of pages, or `None` if it is unknown.
+        drop_order (list of str): optional sections to drop, in order.
+
+    Returns:
+        tuple: the fitted model, its compiled document, its number of pages
+        and the list of changes made to `model`. If even the most trimmed
+        variant does not fit, that variant is returned.
+    """
+    variants = get_variants(model, drop_order)
+    estimates = []
+    for variant_model, spacing, _ in variants:
+        theme_obj.spacing = spacing
+        estimates.append(theme_obj.estimate_pages(variant_model))
+    scale, first = 1, 0
+    while True:
+        i = next((
+            i for i in range(first, len(variants))
+            if estimates[i] * scale <= max_pages * ESTIMATE_MARGIN
+        ), len(variants) - 1)
+        variant_model, theme_obj.spacing, changes = variants[i]
+        doc = theme_obj.format(variant_model)
+        pages = compile_doc(doc)
+        if pages is None or pages <= max_pages or i == len(variants) - 1:
+            return variant_model, doc, pages, changes
+
+        # The real length is between `pages - 1` and `pages`
+        scale = max(scale, (pages - 0.5) / estimates[i])
+        first = i + 1
+
+
+def get_page_count(file_path):
+    """Reads the number of pages of a compiled document from its LaTeX log.
+
+    Args:
+        file_path (str): path of the document, without extension.
+
+    Returns:
+        int: number of pages of the document, or `None` if the log does not
+        exist or does not contain it.
+    """
+    try:
+        with open(file_path + '.log', 'rb') as log_file:
+            log = log_file.read().decode('utf-8', 'replace')
+    except OSError:
+        return None
+    match = PAGES_REGEX.search(log.replace('\n', ''))
+    return int(match.group(1)) if match else None
+
+
+def clean_latex_files(file_path):
+    """Removes the auxiliary files of a LaTeX compilation, as PyLaTeX does
+    with `clean=True`.
+
+    Args:
+        file_path (str): path of the document, without extension.
+    """
+    for extension in ['aux', 'log', 'out', 'fls', 'fdb_latexmk']:
+        if os.path.exists(file_path + '.' + extension):
+            os.remove(file_path + '.' + extension)
+
+
+def _trim_bullets(model_raw, max_bullets):
+    changes = []
+    for section in ['experience', 'education']:
+        for i, item in enumerate(model_raw.get(section, [])):
+            for j, rich_text in enumerate(item.get('description', [])):
+                if rich_text['type'] == 'itemize' and \
+                        len(rich_text['content']) > max_bullets:
+                    changes.append('kept {} of {} bullets of {}[{}].'
+                                   'description[{}]'.format(
+                                       max_bullets, len(rich_text['content']),
+                                       section, i, j
+                                   ))
+                    del rich_text['content'][max_bullets:]
+    return model_raw, changes
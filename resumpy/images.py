@@ -0,0 +1,128 @@
+import resumpy.utils
+import atexit
+import hashlib
+import os
+import shutil
+import tempfile
+
+try:
+    import PIL.Image
+    import PIL.ImageOps
+except ImportError:
+    PIL = None
+
+# Version of the preprocessing, part of the cache keys so that changes in the
+# pipeline invalidate the images prepared by previous versions
+PIPELINE_VERSION = 1
+
+# Extensions of the images that pdfLaTeX can include directly
+SUPPORTED_EXTENSIONS = ['.jpg', '.jpeg', '.png', '.pdf']
+
+_tmp_dir = None
+
+
+def prepare_photo(photo_path, size, dpi=300, logger=None):
+    """Prepares a photo to be included in a document.
+
+    The photo is cropped to a square around its center, downsampled to `dpi`
+    at its printed `size` and stored as a baseline JPEG, which pdfLaTeX embeds
+    without decoding it. Prepared photos are stored in the cache of ResumPY,
+    indexed by the hash of the original file and of the parameters, so that
+    each photo is only prepared once. If the cache folder is not writable,
+    they are stored in a temporary folder removed when the process exits.
+
+    If Pillow is not installed, the original photo is copied to the cache as
+    is, as long as pdfLaTeX can include it. In both cases, the name of the
+    returned file only contains characters which are safe inside LaTeX code.
+
+    Args:
+        photo_path (str): path to the original photo.
+        size (float): printed width and height of the photo, in inches.
+        dpi (int): resolution of the prepared photo.
+        logger (logging.Logger): logger used to report missing dependencies.
+
+    Returns:
+        str: absolute path to the prepared photo.
+
+    Raises:
+        ValueError: if the photo can not be included in a document.
+    """
+    with open(photo_path, 'rb') as photo_file:
+        photo_bytes = photo_file.read()
+    if PIL is None:
+        extension = os.path.splitext(photo_path)[1].lower()
+        if extension not in SUPPORTED_EXTENSIONS:
+            raise ValueError('Install Pillow to include {} photos'.format(
+                extension
+            ))
+        if logger is not None:
+            logger.warning('Install Pillow to reduce the size of the photos.')
+        cache_path = os.path.join(
+            _get_cache_dir(logger), '{}-original{}'.format(
+                hashlib.sha256(photo_bytes).hexdigest(), extension
+            )
+        )
+        if not os.path.exists(cache_path):
+            _write_atomically(cache_path, lambda tmp_path: _write_bytes(
+                tmp_path, photo_bytes
+            ))
+        return cache_path
+
+    size_px = round(size * dpi)
+    photo_hash = hashlib.sha256(photo_bytes).hexdigest()
+    cache_path = os.path.join(
+        _get_cache_dir(logger), '{}-{}-v{}.jpg'.format(
+            photo_hash, size_px, PIPELINE_VERSION
+        )
+    )
+    if os.path.exists(cache_path):
+        return cache_path
+
+    with PIL.Image.open(photo_path) as photo:
+        photo = PIL.ImageOps.exif_transpose(photo)
+        if photo.mode in ['RGBA', 'LA', 'P']:
+            photo = photo.convert('RGBA')
+            background = PIL.Image.new('RGBA', photo.size, 'white')
+            photo = PIL.Image.alpha_composite(background, photo)
+        photo = PIL.ImageOps.fit(
+            photo.convert('RGB'), (size_px, size_px), PIL.Image.LANCZOS
+        ) if min(photo.size) > size_px else PIL.ImageOps.fit(
+            photo.convert('RGB'), (min(photo.size),) * 2
+        )
+        _write_atomically(cache_path, lambda tmp_path: photo.save(
+            tmp_path, 'JPEG', quality=90, optimize=True, dpi=(dpi, dpi)
+        ))
+    return cache_path
+
+
+def _get_cache_dir(logger=None):
+    """Returns the folder where prepared photos are stored, falling back to a
+    temporary folder of the process if the cache is not writable."""
+    global _tmp_dir
+    try:
+        cache_dir = resumpy.utils.get_cache_dir('images')
+        if os.access(cache_dir, os.W_OK):
+            return cache_dir
+    except OSError:
+        pass
+    if _tmp_dir is None:
+        _tmp_dir = tempfile.mkdtemp(prefix='resumpy-images-')
+        atexit.register(shutil.rmtree, _tmp_dir, True)
+        if logger is not None:
+            logger.warning('The cache of ResumPY is not writable. Photos are '
+                           'stored in {}.'.format(_tmp_dir))
+    return _tmp_dir
+
+
+def _write_atomically(file_path, write):
+    """Writes a file through `write`, called with a temporary path which is
+    then moved to `file_path`, so that concurrent renders never read a
+    partially written file."""
+    tmp_path = '{}.{}.tmp'.format(file_path, os.getpid())
+    write(tmp_path)
+    os.replace(tmp_path, file_path)
+
+
+def _write_bytes(file_path, file_bytes):
+    with open(file_path, 'wb') as output_file:
+        output_file.write(file_bytes)
@@ -0,0 +1,418 @@
+import resumpy.utils
+import datetime
+import json
+import numpy as np
+import os
+
+# Sentinel used as `date_end` of experience items that are still ongoing
+DATE_MAX = datetime.date.max.toordinal()
+
+
+class CorpusIndex:
+    """Inverted index over a corpus of `resumpy.model.Model` objects.
+
+    Skills, skill categories, institutions and languages are stored as
+    postings lists of sorted document (or row) numbers. Experience periods
+    and language levels are stored as NumPy arrays, so that range queries are
+    answered with vectorized comparisons and binary searches instead of
+    iterating over the models.
+
+    Postings of each facet are concatenated into a single array, with the
+    offset and length of each term stored in `terms`. This allows the index
+    to be saved as a handful of `.npy` files and memory-mapped when loaded.
+    """
+    doc_ids = None
+    terms = None
+    arrays = None
+
+    postings_facets = [
+        'skill', 'skill_category', 'category', 'institution', 'experience',
+        'language'
+    ]
+
+    def __init__(self, doc_ids, terms, arrays):
+        self.doc_ids = doc_ids
+        self.terms = terms
+        self.arrays = arrays
+
+    @staticmethod
+    def normalize(term):
+        """Normalizes a term before inserting it or looking it up.
+
+        Args:
+            term (str): term to normalize.
+
+        Returns:
+            str: case-folded version of `term` without surrounding spaces.
+        """
+        return ' '.join(str(term).split()).casefold()
+
+    @staticmethod
+    def build(models):
+        """Builds a new index from an iterable of models.
+
+        Args:
+            models (iterable of (str, resumpy.model.Model)): pairs containing
+                the identifier of each document and its model.
+
+        Returns:
+            CorpusIndex: index containing all the documents in `models`.
+        """
+        doc_ids, skills, categories, institutions = [], [], [], []
+        exp_institutions, exp_starts, exp_ends = [], [], []
+        lang_names, lang_levels = [], []
+        counts = {'skill': [], 'experience': [], 'education': [],
+                  'language': []}
+        for doc_id, model in models:
+            doc_ids.append(doc_id)
+            doc_skills = model.get('skills') or []
+            skills.extend(skill.get('name') for skill in doc_skills)
+            categories.extend(
+                skill.get('category') or '' for skill in doc_skills
+            )
+            doc_experience = model.get('experience') or []
+            exp_institutions.extend(
+                experience.get('institution') for experience in doc_experience
+            )
+            exp_starts.extend(
+                experience.get('date_start') for experience in doc_experience
+            )
+            exp_ends.extend(
+                experience.get('date_end') for experience in doc_experience
+            )
+            doc_education = model.get('education') or []
+            institutions.extend(
+                education.get('institution') for education in doc_education
+            )
+            doc_languages = model.get('languages') or []
+            lang_names.extend(
+                language.get('name') for language in doc_languages
+            )
+            lang_levels.extend(
+                language.get('level') for language in doc_languages
+            )
+            for facet, items in [('skill', doc_skills),
+                                 ('experience', doc_experience),
+                                 ('education', doc_education),
+                                 ('language', doc_languages)]:
+                counts[facet].append(len(items))
+
+        # Document number of each skill, experience, education and language
+        docs = {
+            facet: np.repeat(
+                np.arange(len(doc_ids), dtype=np.int32),
+                np.array(facet_counts, dtype=np.int64)
+            ) for facet, facet_counts in counts.items()
+        }
+
+        # Sort experience rows by `date_end` so that "worked after" queries
+        # become a binary search followed by a contiguous slice
+        exp_start = CorpusIndex._to_ordinals(exp_starts)
+        exp_end = CorpusIndex._to_ordinals(exp_ends)
+        exp_order = np.argsort(exp_end, kind='stable')
+        exp_rank = np.empty(len(exp_order), dtype=np.int32)
+        exp_rank[exp_order] = np.arange(len(exp_order), dtype=np.int32)
+
+        # Latest `date_end` of each document, sorted, so that queries with
+        # only the "after" condition are a slice as well
+        latest_end = np.full(len(doc_ids), -1, dtype=np.int32)
+        np.maximum.at(latest_end, docs['experience'], exp_end)
+        latest_doc = np.flatnonzero(latest_end >= 0).astype(np.int32)
+        latest_doc = latest_doc[np.argsort(latest_end[latest_doc],
+                                           kind='stable')]
+
+        skill_ids, skill_terms = CorpusIndex._to_term_ids(skills)
+        category_ids, category_terms = CorpusIndex._to_term_ids(categories)
+        has_category = np.fromiter(
+            (bool(category) for category in categories), dtype=bool,
+            count=len(categories)
+        )
+        skill_category_ids, pairs = np.unique(
+            category_ids[has_category].astype(np.int64) * len(skill_terms) +
+            skill_ids[has_category], return_inverse=True
+        )
+        institution_ids, institution_terms = CorpusIndex._to_term_ids(
+            exp_institutions + institutions
+        )
+        lang_ids, lang_terms = CorpusIndex._to_term_ids(lang_names)
+        level_ids, levels = CorpusIndex._to_term_ids(lang_levels, False)
+        level_scores = np.array([
+            resumpy.utils.get_language_score(level) for level in levels
+        ], dtype=np.int16)
+
+        postings = {
+            'skill': (skill_terms, skill_ids, docs['skill']),
+            'skill_category': ([
+                CorpusIndex._skill_category_term(
+                    skill_terms[pair % len(skill_terms)],
+                    category_terms[pair // len(skill_terms)]
+                ) for pair in skill_category_ids.tolist()
+            ], pairs.reshape(-1), docs['skill'][has_category]),
+            'category': (category_terms, category_ids[has_category],
+                         docs['skill'][has_category]),
+            'institution': (institution_terms, institution_ids, np.concatenate(
+                [docs['experience'], docs['education']]
+            )),
+            'experience': (institution_terms,
+                           institution_ids[:len(exp_institutions)], exp_rank),
+            'language': (lang_terms, lang_ids,
+                         np.arange(len(lang_ids), dtype=np.int32))
+        }
+        terms, arrays = {}, {}
+        for facet, (facet_terms, term_ids, numbers) in postings.items():
+            terms[facet], arrays['postings_' + facet] = \
+                CorpusIndex._to_postings(facet_terms, term_ids, numbers)
+        arrays['experience_doc'] = docs['experience'][exp_order]
+        arrays['experience_start'] = exp_start[exp_order]
+        arrays['experience_end'] = exp_end[exp_order]
+        arrays['experience_latest_doc'] = latest_doc
+        arrays['experience_latest_end'] = latest_end[latest_doc]
+        arrays['language_doc'] = docs['language']
+        arrays['language_score'] = level_scores[level_ids]
+        return CorpusIndex(doc_ids, terms, arrays)
+
+    def save(self, index_path):
+        """Saves the index inside the folder `index_path`.
+
+        Args:
+            index_path (str): path to the folder where the index is stored.
+                It is created if it does not exist.
+        """
+        os.makedirs(index_path, exist_ok=True)
+        with open(os.path.join(index_path, 'index.json'), 'wt') as meta_file:
+            json.dump({'doc_ids': self.doc_ids, 'terms': self.terms},
+                      meta_file)
+        for array_name, array in self.arrays.items():
+            np.save(os.path.join(index_path, array_name + '.npy'), array)
+
+    @staticmethod
+    def load(index_path, mmap=True):
+        """Loads an index previously stored using `CorpusIndex.save`.
+
+        Args:
+            index_path (str): path to the folder containing the index.
+            mmap (bool): whether to memory-map the arrays instead of reading
+                them into memory.
+
+        Returns:
+            CorpusIndex: loaded index.
+        """
+        with open(os.path.join(index_path, 'index.json')) as meta_file:
+            meta = json.load(meta_file)
+        arrays = {}
+        for file_name in os.listdir(index_path):
+            if file_name.endswith('.npy'):
+                arrays[file_name[:-4]] = np.load(
+                    os.path.join(index_path, file_name),
+                    mmap_mode='r' if mmap else None
+                )
+        return CorpusIndex(meta['doc_ids'], meta['terms'], arrays)
+
+    def postings(self, facet, term):
+        """Returns the postings list of `term` inside `facet`.
+
+        Args:
+            facet (str): name of the facet, one of `postings_facets`.
+            term (str): term to look up.
+
+        Returns:
+            numpy.ndarray: sorted document (or row) numbers containing `term`.
+        """
+        offset, length = self.terms[facet].get(
+            self.normalize(term), [0, 0]
+        )
+        return self.arrays['postings_' + facet][offset:offset + length]
+
+    def docs_with_skill(self, name, category=None):
+        """Returns the documents containing the skill `name`.
+
+        Args:
+            name (str): name of the skill.
+            category (str): if set, only skills of this category match.
+
+        Returns:
+            numpy.ndarray: sorted document numbers.
+        """
+        if category is None:
+            return self.postings('skill', name)
+        return self.postings(
+            'skill_category', self._skill_category_term(name, category)
+        )
+
+    def docs_with_category(self, category):
+        """Returns the documents containing any skill of `category`.
+
+        Args:
+            category (str): name of the skills category.
+
+        Returns:
+            numpy.ndarray: sorted document numbers.
+        """
+        return self.postings('category', category)
+
+    def docs_worked_at(self, institution=None, after=None, before=None):
+        """Returns the documents with an experience in a period of time.
+
+        Args:
+            institution (str): if set, only experiences at this institution
+                match.
+            after (datetime.date): if set, the experience must end after this
+                date (ongoing experiences always do).
+            before (datetime.date): if set, the experience must start before
+                this date.
+
+        Returns:
+            numpy.ndarray: unique document numbers. They are sorted, except
+            when only `after` is set: then they are a slice of the documents
+            sorted by the end of their latest experience.
+        """
+        if institution is None and after is None and before is None:
+            return np.unique(self.arrays['experience_doc'])
+        exp_end = self.arrays['experience_end']
+        first_row = 0 if after is None else int(np.searchsorted(
+            exp_end, after.toordinal(), side='left'
+        ))
+        if institution is None and before is None:
+            latest_end = self.arrays['experience_latest_end']
+            return self.arrays['experience_latest_doc'][int(np.searchsorted(
+                latest_end, after.toordinal(), side='left'
+            )):]
+        if institution is not None:
+            rows = self.postings('experience', institution)
+            rows = rows[np.searchsorted(rows, first_row):]
+        else:
+            rows = np.arange(first_row, len(exp_end))
+        if before is not None:
+            rows = rows[
+                self.arrays['experience_start'][rows] <= before.toordinal()
+            ]
+        return np.unique(self.arrays['experience_doc'][rows])
+
+    def docs_at_institution(self, institution):
+        """Returns the documents with an experience or education at
+        `institution`.
+
+        Args:
+            institution (str): name of the institution.
+
+        Returns:
+            numpy.ndarray: sorted document numbers.
+        """
+        return self.postings('institution', institution)
+
+    def docs_speaking(self, language, min_level=None):
+        """Returns the documents containing the language `language`.
+
+        Args:
+            language (str): name of the language.
+            min_level (str): if set, minimum CEFR level of the language.
+
+        Returns:
+            numpy.ndarray: sorted document numbers.
+        """
+        rows = self.postings('language', language)
+        if min_level is not None:
+            rows = rows[self.arrays['language_score'][rows] >=
+                        resumpy.utils.get_language_score(min_level)]
+        return np.unique(self.arrays['language_doc'][rows])
+
+    def query(self, skill=None, category=None, institution=None, after=None,
+              before=None, language=None, min_level=None):
+        """Returns the identifiers of the documents matching all the given
+        conditions.
+
+        Example: documents with the skill "Python" in the category
+        "Languages", that worked at "UBS" after 2018 and speak German at a C1
+        level or higher:
+        ```
+            index.query(skill='Python', category='Languages',
+                        institution='UBS', after=datetime.date(2018, 1, 1),
+                        language='German', min_level='C1')
+        ```
+
+        Args:
+            skill (str): name of a skill.
+            category (str): category of `skill`, or any skill if `skill` is
+                not set.
+            institution (str): institution of an experience item.
+            after (datetime.date): the experience must end after this date.
+            before (datetime.date): the experience must start before this
+                date.
+            language (str): name of a language.
+            min_level (str): minimum CEFR level of `language`.
+
+        Returns:
+            list of str: identifiers of the matching documents.
+        """
+        results = []
+        if skill is not None:
+            results.append(self.docs_with_skill(skill, category))
+        elif category is not None:
+            results.append(self.docs_with_category(category))
+        if institution is not None or after is not None or before is not None:
+            results.append(self.docs_worked_at(institution, after, before))
+        if language is not None:
+            results.append(self.docs_speaking(language, min_level))
+        if not results:
+            return list(self.doc_ids)
+
+        # Intersect starting from the shortest postings list
+        results.sort(key=len)
+        docs = results[0]
+        for other_docs in results[1:]:
+            docs = np.intersect1d(docs, other_docs, assume_unique=True)
+        return [self.doc_ids[doc_number] for doc_number in docs.tolist()]
+
+    def __len__(self):
+        return len(self.doc_ids)
+
+    @staticmethod
+    def _skill_category_term(name, category):
+        return CorpusIndex.normalize(category) + '\x00' + \
+               CorpusIndex.normalize(name)
+
+    @staticmethod
+    def _to_ordinals(dates):
+        """Converts a list of dates to proleptic Gregorian ordinals, with
+        `DATE_MAX` in place of `None`."""
+        return np.fromiter(
+            (date.toordinal() if date else DATE_MAX for date in dates),
+            dtype=np.int32, count=len(dates)
+        )
+
+    @staticmethod
+    def _to_term_ids(values, normalize=True):
+        """Maps a list of values to the number of their term, normalizing
+        each distinct value only once.
+
+        Returns:
+            tuple: array with the term number of each value, and sorted list
+            of terms.
+        """
+        unique_values = dict.fromkeys(values)
+        for value_id, value in enumerate(unique_values):
+            unique_values[value] = value_id
+        value_ids = np.fromiter(
+            map(unique_values.__getitem__, values), dtype=np.int32,
+            count=len(values)
+        )
+        unique_terms, term_ids = np.unique(np.array([
+            CorpusIndex.normalize(value) if normalize else str(value)
+            for value in unique_values
+        ], dtype=str), return_inverse=True)
+        return term_ids.reshape(-1)[value_ids].astype(np.int32), \
+            unique_terms.tolist()
+
+    @staticmethod
+    def _to_postings(terms, term_ids, numbers):
+        """Groups `numbers` by term into the offsets of each term and a single
+        array of postings, sorted and without duplicates inside each term."""
+        stride = int(numbers.max()) + 1 if len(numbers) else 1
+        keys = np.sort(term_ids.astype(np.int64) * stride + numbers)
+        keys = keys[np.diff(keys, prepend=-1) != 0]
+        counts = np.bincount(keys // stride, minlength=len(terms))
+        offsets = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        return {
+            term: [offset, count] for term, offset, count
+            in zip(terms, offsets.tolist(), counts.tolist()) if count
+        }, (keys % stride).astype(np.int32)
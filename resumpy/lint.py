@@ -0,0 +1,247 @@
+import resumpy.model
+import resumpy.utils
+import datetime
+import pylatex.utils
+import re
+
+# Characters that pdfLaTeX can typeset with the `inputenc`, `fontenc` and
+# `textcomp` packages loaded by the themes
+SUPPORTED_CHARACTERS = frozenset(
+    '\n\t' + ''.join(chr(c) for c in range(0x20, 0x7f)) +
+    ''.join(chr(c) for c in range(0xa0, 0x180)) +
+    '\u2013\u2014\u2018\u2019\u201a\u201c\u201d\u201e\u2020\u2021\u2022'
+    '\u2026\u2030\u2039\u203a\u20ac\u2122'
+)
+
+# Characters of links which break the compilation (errors) or are mangled by
+# LaTeX (warnings). Both are fixed by percent-encoding them, as well as any
+# non-ASCII character
+LINK_UNSAFE_CHARACTERS = {'\\': 'error', '{': 'error', '}': 'error',
+                          '^': 'warning', '~': 'warning', ' ': 'warning'}
+
+ESCAPED_COMMAND_REGEX = re.compile(r'\\textbackslash\{\}([a-zA-Z]+)')
+
+
+class LintIssue:
+    """Problem found in the content of a CV.
+
+    Attributes:
+        path (str): path of the field containing the problem, for instance
+            `experience[0].description[1].content`, or `None` if it could not
+            be mapped to a field.
+        message (str): description of the problem.
+        severity (str): `error` if the problem breaks the compilation or
+            `warning` if the content will be mangled.
+        fixed_value (str): value of the field without the problem, or `None`
+            if it can not be fixed automatically.
+    """
+    path = None
+    message = None
+    severity = None
+    fixed_value = None
+
+    def __init__(self, path, message, severity, fixed_value=None):
+        self.path = path
+        self.message = message
+        self.severity = severity
+        self.fixed_value = fixed_value
+
+    def __str__(self):
+        return '[{}] {}: {}'.format(
+            self.severity, self.path or '<unknown field>', self.message
+        )
+
+
+class LintError(Exception):
+    """Raised when the content of a CV would break its compilation."""
+    issues = None
+
+    def __init__(self, issues):
+        super(LintError, self).__init__('\n'.join(str(i) for i in issues))
+        self.issues = issues
+
+
+def lint_model(model):
+    """Finds content of `model` which will break or be mangled by LaTeX.
+
+    Args:
+        model (resumpy.model.Model): model to lint.
+
+    Returns:
+        list of LintIssue: problems found in the model.
+    """
+    issues = []
+    for path, value, field_type in _walk(model, ()):
+        if field_type is resumpy.model.LinkItem and path[-1] == 'href':
+            issues += _lint_link(path, value)
+        else:
+            issues += _lint_text(path, value)
+        if field_type is resumpy.model.LanguageItem and path[-1] == 'level':
+            try:
+                resumpy.utils.get_language_score(value)
+            except KeyError:
+                issues.append(LintIssue(
+                    _format_path(path),
+                    '{!r} is not a CEFR language level'.format(value),
+                    'error'
+                ))
+    return issues
+
+
+def lint_latex(tex, model):
+    """Finds problems in the LaTeX code generated from `model`.
+
+    Problems are mapped back to the fields of `model` whose content appears
+    in the offending line.
+
+    Args:
+        tex (str): LaTeX code generated from `model`.
+        model (resumpy.model.Model): model used to generate `tex`.
+
+    Returns:
+        list of LintIssue: problems found in the LaTeX code.
+    """
+    issues, depth, open_lines = [], 0, []
+    lines = tex.split('\n')
+    for line_number, line in enumerate(lines):
+        line = _strip_comment(line)
+        for command in ESCAPED_COMMAND_REGEX.findall(line):
+            issues.append(LintIssue(
+                _find_path(line, model),
+                'LaTeX command \\{} is escaped and printed literally (line '
+                '{})'.format(command, line_number + 1), 'warning'
+            ))
+        for char in re.sub(r'\\.', '', line):
+            if char == '{':
+                open_lines.append(line_number)
+                depth += 1
+            elif char == '}':
+                depth -= 1
+                if depth < 0:
+                    issues.append(LintIssue(
+                        _find_path(line, model),
+                        'unbalanced "}}" (line {})'.format(line_number + 1),
+                        'error'
+                    ))
+                    depth = 0
+                else:
+                    open_lines.pop()
+    for line_number in open_lines:
+        issues.append(LintIssue(
+            _find_path(lines[line_number], model),
+            'unbalanced "{{" (line {})'.format(line_number + 1), 'error'
+        ))
+    return issues
+
+
+def fix_model(model, issues):
+    """Returns a new model with the fixable issues fixed.
+
+    Args:
+        model (resumpy.model.Model): model containing the issues.
+        issues (list of LintIssue): issues returned by `lint_model`.
+
+    Returns:
+        resumpy.model.Model: fixed model, or `model` if nothing was fixed.
+    """
+    fixable_issues = [i for i in issues if i.fixed_value is not None]
+    if not fixable_issues:
+        return model
+    model_raw = model.dump()
+    for issue in fixable_issues:
+        item, path = model_raw, _parse_path(issue.path)
+        for key in path[:-1]:
+            item = item[key]
+        item[path[-1]] = issue.fixed_value
+    return resumpy.model.Model(model_raw)
+
+
+def _lint_link(path, value):
+    issues, fixed_value = [], value
+    for char in sorted(set(value)):
+        severity = LINK_UNSAFE_CHARACTERS.get(char) or (
+            'error' if char not in SUPPORTED_CHARACTERS else None
+        )
+        if severity is None and 0x20 <= ord(char) < 0x7f:
+            continue
+        fixed_value = fixed_value.replace(char, ''.join(
+            '%{:02X}'.format(byte) for byte in char.encode('utf-8')
+        ))
+        issues.append(LintIssue(
+            _format_path(path),
+            'character {!r} is not safe inside a LaTeX link'.format(char),
+            severity or 'warning'
+        ))
+    for issue in issues:
+        issue.fixed_value = fixed_value
+    return issues
+
+
+def _lint_text(path, value):
+    unsupported = sorted(set(value) - SUPPORTED_CHARACTERS)
+    if not unsupported:
+        return []
+    return [LintIssue(
+        _format_path(path),
+        'characters {} can not be typeset by pdfLaTeX'.format(
+            ', '.join('{!r}'.format(c) for c in unsupported)
+        ),
+        'error',
+        ''.join(c for c in value if c in SUPPORTED_CHARACTERS)
+    )]
+
+
+def _walk(item, path):
+    """Yields the path, the value and the type of the containing item of
+    every string stored inside `item`."""
+    for attr in dir(item):
+        field = getattr(item, attr)
+        if not isinstance(field, resumpy.model.Field) or field.value is None:
+            continue
+        values = enumerate(field.value) if isinstance(field.value, list) \
+            else [(None, field.value)]
+        for i, value in values:
+            value_path = path + (field.name,) + ((i,) if i is not None else ())
+            if isinstance(value, resumpy.model.ItemBase):
+                yield from _walk(value, value_path)
+            elif isinstance(value, str):
+                yield value_path, value, type(item)
+            elif not isinstance(value, (datetime.date, int, float)):
+                yield from _walk_raw(value, value_path, type(item))
+
+
+def _walk_raw(value, path, item_type):
+    if isinstance(value, str):
+        yield path, value, item_type
+    elif isinstance(value, list):
+        for i, list_value in enumerate(value):
+            yield from _walk_raw(list_value, path + (i,), item_type)
+
+
+def _format_path(path):
+    return ''.join(
+        '[{}]'.format(key) if isinstance(key, int) else '.' + key
+        for key in path
+    ).lstrip('.')
+
+
+def _parse_path(path):
+    return [int(key) if key.isdigit() else key
+            for key in re.findall(r'[^.\[\]]+', path)]
+
+
+def _strip_comment(line):
+    match = re.search(r'(?<!\\)(\\\\)*%', line)
+    return line[:match.start()] if match else line
+
+
+def _find_path(line, model):
+    for path, value, _ in _walk(model, ()):
+        first_line = value.strip().split('\n')[0]
+        if len(first_line) >= 3 and (
+                first_line in line or
+                pylatex.utils.escape_latex(first_line) in line or
+                resumpy.utils.escape_link(first_line) in line
+        ):
+            return _format_path(path)
+    return None
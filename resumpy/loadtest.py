@@ -0,0 +1,291 @@
+import resumpy
+import argparse
+import concurrent.futures
+import copy
+import json
+import logging
+import os
+import resource
+import sys
+import tempfile
+import time
+
+# Python code used as a stub LaTeX compiler. It is called by PyLaTeX as
+# `python -c STUB_COMPILER --interaction=nonstopmode <file>.tex` and writes an
+# empty one-page PDF, so that the Python side can be measured without TeX
+STUB_COMPILER = '''import sys
+open(sys.argv[-1][:-4] + '.pdf', 'wb').write(
+    b'%PDF-1.4\\n1 0 obj<</Type/Catalog/Pages 2 0 R>>endobj\\n'
+    b'2 0 obj<</Type/Pages/Kids[3 0 R]/Count 1>>endobj\\n'
+    b'3 0 obj<</Type/Page/Parent 2 0 R/MediaBox[0 0 595 842]>>endobj\\n'
+    b'trailer<</Root 1 0 R>>\\n%%EOF\\n'
+)'''
+
+# Number of consecutive failed generations after which a worker stops, as the
+# rest of its generations would most likely fail for the same reason
+MAX_CONSECUTIVE_ERRORS = 10
+
+HISTOGRAM_BUCKETS_MS = [
+    1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 20000
+]
+
+
+def make_synthetic_cv_raw(cv_raw, scale):
+    """Creates a bigger CV repeating the items of the list sections of
+    `cv_raw`.
+
+    Repeated items are renamed, so that the CV is still valid against the
+    `uniqueItems` constraints of the schema.
+
+    Args:
+        cv_raw (dict): raw data of the base CV.
+        scale (int): number of copies of each item.
+
+    Returns:
+        dict: raw data of the synthetic CV.
+    """
+    cv_raw_synthetic = copy.deepcopy(cv_raw)
+    for section, items in cv_raw.items():
+        if not isinstance(items, list):
+            continue
+        cv_raw_synthetic[section] = []
+        for i in range(scale):
+            for item in copy.deepcopy(items):
+                if i > 0:
+                    key = next(k for k in ['name', 'title', 'position',
+                                           'degree'] if k in item)
+                    item[key] += ' {}'.format(i + 1)
+                cv_raw_synthetic[section].append(item)
+    return cv_raw_synthetic
+
+
+def get_percentile(sorted_values, percentile):
+    """Returns the nearest-rank percentile of a sorted list of values.
+
+    Args:
+        sorted_values (list of float): values sorted in ascending order.
+        percentile (float): percentile to compute, between 0 and 100.
+
+    Returns:
+        float: value of the percentile, or `None` if `sorted_values` is
+        empty.
+    """
+    if not sorted_values:
+        return None
+    rank = max(int(-(-percentile * len(sorted_values) // 100)), 1)
+    return sorted_values[rank - 1]
+
+
+def run_worker(worker_id, cv_file_path, cv_schema_path, theme_name,
+               duration, stub_compiler, output_dir):
+    """Generates CVs in a loop during `duration` seconds.
+
+    The first error of each kind is logged. The worker stops early after
+    `MAX_CONSECUTIVE_ERRORS` consecutive errors.
+
+    Args:
+        worker_id (int): identifier of the worker.
+        cv_file_path (str): path to the CV to generate.
+        cv_schema_path (str): path to the schema used to validate the CV.
+        theme_name (str): name of the theme to use.
+        duration (float): duration of the test, in seconds.
+        stub_compiler (bool): whether to use a stub instead of LaTeX.
+        output_dir (str): folder where generated files are stored.
+
+    Returns:
+        dict: latencies of each generation, in seconds, the number of errors
+        of each kind, and the CPU time and the peak RSS of the worker and its
+        TeX subprocesses.
+    """
+    worker_dir = os.path.join(output_dir, 'worker-{}'.format(worker_id))
+    os.makedirs(worker_dir, exist_ok=True)
+    compiler, compiler_args = (sys.executable, ['-c', STUB_COMPILER]) \
+        if stub_compiler else (None, None)
+    logger = logging.getLogger('resumpy')
+    latencies, errors, consecutive_errors = [], {}, 0
+    time_end = time.perf_counter() + duration
+    while time.perf_counter() < time_end and \
+            consecutive_errors < MAX_CONSECUTIVE_ERRORS:
+        time_start = time.perf_counter()
+        try:
+            cv = resumpy.CV(logger)
+            cv.load(cv_file_path, cv_schema_path)
+            cv.generate(
+                theme_name, os.path.join(worker_dir, 'cv'), keep_tex=False,
+                compiler=compiler, compiler_args=compiler_args
+            )
+        except (Exception, SystemExit) as e:
+            error = '{}: {}'.format(type(e).__name__, str(e).split('\n')[0])
+            if error not in errors:
+                logger.error('Worker {}: {}'.format(worker_id, error))
+            errors[error] = errors.get(error, 0) + 1
+            consecutive_errors += 1
+            continue
+        latencies.append(time.perf_counter() - time_start)
+        consecutive_errors = 0
+    if consecutive_errors >= MAX_CONSECUTIVE_ERRORS:
+        logger.error('Worker {} stopped after {} consecutive errors'.format(
+            worker_id, consecutive_errors
+        ))
+    usage_self = resource.getrusage(resource.RUSAGE_SELF)
+    usage_children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return {
+        'latencies': latencies,
+        'errors': errors,
+        'cpu_time': usage_self.ru_utime + usage_self.ru_stime +
+        usage_children.ru_utime + usage_children.ru_stime,
+        'max_rss': usage_self.ru_maxrss,
+        'max_rss_children': usage_children.ru_maxrss
+    }
+
+
+def run_load_test(cv_file_path, cv_schema_path, theme_name, workers,
+                  duration, stub_compiler, output_dir):
+    """Runs `workers` concurrent workers generating CVs during `duration`
+    seconds.
+
+    Args:
+        cv_file_path (str): path to the CV to generate.
+        cv_schema_path (str): path to the schema used to validate the CV.
+        theme_name (str): name of the theme to use.
+        workers (int): number of concurrent worker processes.
+        duration (float): duration of the test, in seconds.
+        stub_compiler (bool): whether to use a stub instead of LaTeX.
+        output_dir (str): folder where generated files are stored.
+
+    Returns:
+        dict: aggregated results of the test.
+    """
+    time_start = time.perf_counter()
+    with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+        results = list(executor.map(
+            run_worker, range(workers), [cv_file_path] * workers,
+            [cv_schema_path] * workers, [theme_name] * workers,
+            [duration] * workers, [stub_compiler] * workers,
+            [output_dir] * workers
+        ))
+    elapsed = time.perf_counter() - time_start
+    latencies = sorted(
+        latency for result in results for latency in result['latencies']
+    )
+    errors = {}
+    for result in results:
+        for error, count in result['errors'].items():
+            errors[error] = errors.get(error, 0) + count
+    return {
+        'workers': workers,
+        'elapsed': elapsed,
+        'count': len(latencies),
+        'errors': sum(errors.values()),
+        'error_kinds': errors,
+        'throughput': len(latencies) / elapsed * 60,
+        'latencies': latencies,
+        'p50': get_percentile(latencies, 50),
+        'p95': get_percentile(latencies, 95),
+        'p99': get_percentile(latencies, 99),
+        'cpu_time': sum(result['cpu_time'] for result in results),
+        'max_rss': max(result['max_rss'] for result in results),
+        'max_rss_children': max(
+            result['max_rss_children'] for result in results
+        )
+    }
+
+
+def format_results(results):
+    """Formats the results of `run_load_test` as a human-readable report.
+
+    Args:
+        results (dict): results returned by `run_load_test`.
+
+    Returns:
+        str: report of the results.
+    """
+    def ms(value):
+        return '{:.1f} ms'.format(value * 1000) if value is not None else '-'
+
+    # `ru_maxrss` is given in kilobytes on Linux and in bytes on macOS
+    rss_unit = 1 if sys.platform == 'darwin' else 1024
+    lines = [
+        'Workers: {}'.format(results['workers']),
+        'Generated CVs: {} ({} errors) in {:.1f} s'.format(
+            results['count'], results['errors'], results['elapsed']
+        ),
+    ] + [
+        '  {} x {}'.format(count, error)
+        for error, count in sorted(results['error_kinds'].items())
+    ] + [
+        'Throughput: {:.1f} CVs/minute'.format(results['throughput']),
+        'Latency: p50 {} | p95 {} | p99 {}'.format(
+            ms(results['p50']), ms(results['p95']), ms(results['p99'])
+        ),
+        'CPU time: {:.1f} s ({:.0%} of {} cores)'.format(
+            results['cpu_time'],
+            results['cpu_time'] / results['elapsed'] / (os.cpu_count() or 1),
+            os.cpu_count()
+        ),
+        'Peak RSS: {:.1f} MB (Python worker), {:.1f} MB (compiler)'.format(
+            results['max_rss'] * rss_unit / 2 ** 20,
+            results['max_rss_children'] * rss_unit / 2 ** 20
+        ),
+        'Latency histogram:'
+    ]
+    bucket_start = 0
+    for bucket_end in HISTOGRAM_BUCKETS_MS + [float('inf')]:
+        count = sum(
+            1 for latency in results['latencies']
+            if bucket_start <= latency * 1000 < bucket_end
+        )
+        if count > 0:
+            lines.append('  {:>7} - {:<7} ms {:>6} {}'.format(
+                bucket_start, bucket_end, count,
+                '#' * max(round(50 * count / results['count']), 1)
+            ))
+        bucket_start = bucket_end
+    return '\n'.join(lines)
+
+
+if __name__ == '__main__':
+    base_path = os.path.dirname(os.path.dirname(__file__))
+    parser = argparse.ArgumentParser(description='Load test Resumpy')
+    parser.add_argument(
+        '--cv-file', default=os.path.join(base_path, 'cv.example.json'),
+        help='Relative or absolute path to the base .json or .yaml CV file'
+    )
+    parser.add_argument(
+        '--theme', choices=['sitges'], default='sitges',
+        help='Name of the theme of the generated resumes'
+    )
+    parser.add_argument(
+        '--scale', type=int, default=1,
+        help='Number of copies of each item of the base CV'
+    )
+    parser.add_argument(
+        '--workers', type=int, nargs='+', default=[1, os.cpu_count() or 1],
+        help='Concurrency levels to test'
+    )
+    parser.add_argument(
+        '--duration', type=float, default=30,
+        help='Duration of each test, in seconds'
+    )
+    parser.add_argument(
+        '--stub-compiler', action='store_true',
+        help='Replace LaTeX with a stub, to measure only the Python side'
+    )
+    args = parser.parse_args()
+    cv_schema_path = os.path.join(base_path, 'cv.schema.json')
+
+    # Store the synthetic CV in a file, so that it is loaded and validated
+    # as part of each generation
+    cv = resumpy.CV(logging.getLogger('resumpy'))
+    cv.load(args.cv_file, cv_schema_path)
+    with tempfile.TemporaryDirectory() as output_dir:
+        cv_file_path = os.path.join(output_dir, 'cv.json')
+        with open(cv_file_path, 'wt') as cv_file:
+            json.dump(
+                make_synthetic_cv_raw(cv.model.dump(), args.scale), cv_file
+            )
+        for workers in args.workers:
+            print(format_results(run_load_test(
+                cv_file_path, cv_schema_path, args.theme, workers,
+                args.duration, args.stub_compiler, output_dir
+            )) + '\n')
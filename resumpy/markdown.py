@@ -0,0 +1,151 @@
+import resumpy.utils
+import functools
+import pylatex.utils
+import re
+
+# Number of converted texts kept in memory. See `to_latex`
+CACHE_SIZE = 1024
+
+# Maximum nesting of lists supported by LaTeX
+MAX_LIST_DEPTH = 4
+
+LIST_ITEM_REGEX = re.compile(r'^( *)([-*+]|\d+[.)]) +(.*)$')
+
+FENCE_REGEX = re.compile(r'^ *(```|~~~)')
+
+INLINE_REGEX = re.compile(
+    r'`(?P<code>[^`]+)`'
+    r'|\[(?P<anchor>[^\]]+)\]\((?P<href>[^)\s]+)\)'
+    r'|(?P<strong>\*\*|__)(?P<bold>.+?)(?P=strong)'
+    r'|\*(?P<italic>(?:\*\*.+?\*\*|[^*])+)\*'
+    r'|(?<!\w)_(?P<underscore_italic>[^_]+)_(?!\w)'
+)
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def to_latex(text):
+    """Converts a Markdown text to LaTeX.
+
+    Supports paragraphs, bold, italics, links, inline code, fenced code
+    blocks and nested bulleted and numbered lists. Any other character is
+    escaped, so the result can be appended to a document as is.
+
+    Conversions are memoized by the content of `text`, so descriptions which
+    are repeated across CVs or variants of a CV are only converted once.
+
+    Args:
+        text (str): Markdown text to convert.
+
+    Returns:
+        str: LaTeX code equivalent to `text`.
+    """
+    blocks, paragraph, lists, code = [], [], [], None
+    for line in text.split('\n'):
+        if code is not None:
+            if FENCE_REGEX.match(line):
+                blocks.append(_format_code(code))
+                code = None
+            else:
+                code.append(line)
+            continue
+        list_item = LIST_ITEM_REGEX.match(line)
+        if FENCE_REGEX.match(line) or list_item or not line.strip():
+            if paragraph:
+                blocks.append(_format_inline(' '.join(paragraph)))
+                paragraph = []
+        if FENCE_REGEX.match(line):
+            blocks += _close_lists(lists, -1)
+            code = []
+        elif list_item:
+            indent, bullet, content = list_item.groups()
+            environment = 'itemize' if bullet in '-*+' else 'enumerate'
+            closed_lists = _close_lists(lists, len(indent))
+            if lists and lists[-1][0] == len(indent) and \
+                    lists[-1][1] != environment:
+                closed_lists += _close_lists(lists, len(indent) - 1)
+            if not lists or lists[-1][0] < len(indent):
+                if len(lists) < MAX_LIST_DEPTH:
+                    lists.append((len(indent), environment))
+                    closed_lists.append('\\begin{{{}}}'.format(environment))
+            blocks += closed_lists
+            blocks.append('\\item ' + _format_inline(content))
+        elif not line.strip():
+            continue
+        elif lists and line.startswith(' '):
+            blocks[-1] += ' ' + _format_inline(line.strip())
+        else:
+            blocks += _close_lists(lists, -1)
+            paragraph.append(line.strip())
+    if code is not None:
+        blocks.append(_format_code(code))
+    if paragraph:
+        blocks.append(_format_inline(' '.join(paragraph)))
+    blocks += _close_lists(lists, -1)
+    return _join_blocks(blocks)
+
+
+def _close_lists(lists, indent):
+    closed_lists = []
+    while lists and lists[-1][0] > indent:
+        closed_lists.append('\\end{{{}}}'.format(lists.pop()[1]))
+    return closed_lists
+
+
+def _join_blocks(blocks):
+    """Separates paragraphs with blank lines, and any other block with line
+    breaks."""
+    tex = ''
+    for block in blocks:
+        if tex:
+            is_paragraph = not block.startswith(('\\item', '\\begin', '\\end'))
+            was_paragraph = not tex.split('\n')[-1].startswith(
+                ('\\item', '\\begin', '\\end')
+            )
+            tex += '\n\n' if is_paragraph and was_paragraph else '\n'
+        tex += block
+    return tex
+
+
+def _format_inline(text):
+    tex, position = '', 0
+    for match in INLINE_REGEX.finditer(text):
+        tex += _escape(text[position:match.start()])
+        if match.group('code') is not None:
+            tex += '\\texttt{{{}}}'.format(_escape(match.group('code')))
+        elif match.group('href') is not None:
+            tex += '\\href{{{}}}{{{}}}'.format(
+                _escape_href(match.group('href')),
+                _format_inline(match.group('anchor'))
+            )
+        elif match.group('bold') is not None:
+            tex += '\\textbf{{{}}}'.format(_format_inline(match.group('bold')))
+        else:
+            tex += '\\textit{{{}}}'.format(_format_inline(
+                match.group('italic') or match.group('underscore_italic')
+            ))
+        position = match.end()
+    return tex + _escape(text[position:])
+
+
+def _format_code(lines):
+    """Formats the lines of a fenced code block, without its surrounding
+    blank lines. Blank lines inside it are kept with an empty box, since
+    `\\newline` fails if there is nothing to end."""
+    while lines and not lines[0].strip():
+        lines = lines[1:]
+    while lines and not lines[-1].strip():
+        lines = lines[:-1]
+    return '{{\\ttfamily\\raggedright\n{}\\par}}'.format('\\newline\n'.join(
+        '~' * (len(line) - len(line.lstrip(' '))) + _escape(line.lstrip(' '))
+        if line else '\\mbox{}' for line in lines
+    ))
+
+
+def _escape(text):
+    return str(pylatex.utils.escape_latex(text))
+
+
+def _escape_href(href):
+    return resumpy.utils.escape_link(''.join(
+        '%{:02X}'.format(ord(c)) if c in '\\{}' else c for c in href
+    ))
@@ -1,5 +1,7 @@
 import datetime
 import copy
+import hashlib
+import json
 
 
 class Field:
@@ -7,17 +9,45 @@ class Field:
     data_type = None
     is_list = None
     nullable = None
-    value = None
+    ordered = None
+    lazy = False
+    raw = None
 
     def __init__(self, name, data_type, is_list=False, nullable=True,
-                 value=None):
+                 value=None, ordered=True):
         self.name = name
         self.data_type = data_type
         self.is_list = is_list
         self.nullable = nullable
+        self.ordered = ordered
         self.value = value
 
-    def load(self, data):
+    @property
+    def value(self):
+        if self.raw is not None:
+            self._load(self.raw)
+        return self._value
+
+    @value.setter
+    def value(self, value):
+        self.raw = None
+        self._value = value
+
+    def load(self, data, lazy=False):
+        """Loads the value of the field from its parent raw data.
+
+        Args:
+            data (dict): raw data of the item containing the field.
+            lazy (bool): whether to keep `data` and delay the conversion of
+                the value until it is accessed for the first time.
+        """
+        self.lazy = lazy
+        if lazy:
+            self.raw, self._value = data, None
+        else:
+            self._load(data)
+
+    def _load(self, data):
         if self.nullable and self.name not in data or data[self.name] is None:
             self.value = None
         elif self.is_list:
@@ -37,9 +67,23 @@ class Field:
             return bool(data[self.name])
         if self.data_type == datetime.date:
             return datetime.date.fromisoformat(data[self.name])
-        return self.data_type(data if self.is_list else data[self.name])
+        return self.data_type(
+            data if self.is_list else data[self.name], lazy=self.lazy
+        )
 
     def dump(self):
+        """Dumps the value of the field.
+
+        Fields loaded lazily which have not been accessed are dumped from the
+        raw data of their parent, without converting it into items. Only the
+        declared, non-empty fields are kept, so that lazy and eager fields
+        dump the same data.
+
+        Returns:
+            object: raw value of the field, or `None` if it is empty.
+        """
+        if self.raw is not None:
+            return self._dump_raw(self.raw)
         if self.value is None:
             return None
         if self.is_list:
@@ -53,18 +97,74 @@ class Field:
             return self.value.isoformat()
         return item.dump() if item is not None else self.value.dump()
 
+    def _dump_raw(self, data):
+        if self.nullable and self.name not in data or data[self.name] is None:
+            return None
+        if self.is_list:
+            return [
+                self._dump_raw_by_type(item) for item in data[self.name]
+            ] or None
+        return self._dump_raw_by_type(data[self.name])
+
+    def _dump_raw_by_type(self, value):
+        if self.data_type == str:
+            return value
+        if self.data_type in [int, float, bool]:
+            return self.data_type(value)
+        if self.data_type == datetime.date:
+            return datetime.date.fromisoformat(value).isoformat()
+        return self.data_type.dump_raw(value)
+
+    def fingerprint(self, cached=True):
+        """Returns a canonical hash of the value of the field.
+
+        Values which are not dumped, such as `None` or empty strings, have no
+        fingerprint. The order of the items of list fields is ignored if the
+        field is not `ordered`.
+
+        Args:
+            cached (bool): whether to reuse the fingerprints cached by the
+                items of the value. See `ItemBase.fingerprint`.
+
+        Returns:
+            str: hexadecimal hash of the value, or `None` if it is empty.
+        """
+        if not self.value:
+            return None
+        fingerprints = [
+            item.fingerprint(cached) if isinstance(item, ItemBase)
+            else _hash(json.dumps(item, sort_keys=True, default=str))
+            for item in (self.value if self.is_list else [self.value])
+        ]
+        if not self.ordered:
+            fingerprints.sort(key=str)
+        return fingerprints[0] if not self.is_list else _hash(
+            json.dumps(fingerprints)
+        )
+
 
 class ItemBase:
+    _fingerprint = None
 
-    def __init__(self, data=None):
+    def __init__(self, data=None, lazy=False):
         if data is not None:
-            self.load(data)
-
-    def load(self, data):
+            self.load(data, lazy)
+
+    def load(self, data, lazy=False):
+        """Loads the raw data into the fields of the item.
+
+        Args:
+            data (dict): raw data of the item.
+            lazy (bool): whether to convert each field on its first access
+                instead of converting all of them now. Converted values are
+                cached in the field, and untouched fields are dumped directly
+                from `data`.
+        """
+        self._fingerprint = None
         for attr in dir(self):
             if isinstance(getattr(self, attr), Field):
-                setattr(self, attr, copy.deepcopy(getattr(self, attr)))
-                getattr(self, attr).load(data)
+                setattr(self, attr, copy.copy(getattr(self, attr)))
+                getattr(self, attr).load(data, lazy)
 
     def get(self, *args):
         obj = self
@@ -81,8 +181,61 @@ class ItemBase:
                     data[attr] = attr_data
         return data
 
+    @classmethod
+    def dump_raw(cls, data):
+        """Dumps the raw data of an item without loading it.
+
+        Args:
+            data (dict): raw data of the item.
+
+        Returns:
+            dict: same data returned by `dump` for an item loaded from `data`.
+        """
+        dumped = {}
+        for attr in dir(cls):
+            if isinstance(getattr(cls, attr), Field):
+                attr_data = getattr(cls, attr)._dump_raw(data)
+                if attr_data:
+                    dumped[attr] = attr_data
+        return dumped
+
+    def fingerprint(self, cached=True):
+        """Returns a canonical hash of the content of the item.
+
+        Two items have the same fingerprint if their dumps are equal, except
+        for the order of the items of fields which are not `ordered`. By
+        default, the fingerprint is computed once and cached, as used by
+        `hash()` and `resumpy.dedup.DuplicateDetector`, so the item must not
+        be modified after calling this method. Equality computes it again.
+
+        Args:
+            cached (bool): whether to reuse and store the cached fingerprint.
+
+        Returns:
+            str: hexadecimal hash of the item, or `None` if it is empty.
+        """
+        if cached and self._fingerprint is not None:
+            return self._fingerprint or None
+        fingerprints = {}
+        for attr in dir(self):
+            if isinstance(getattr(self, attr), Field):
+                fingerprint = getattr(self, attr).fingerprint(cached)
+                if fingerprint is not None:
+                    fingerprints[attr] = fingerprint
+        fingerprint = _hash(json.dumps(
+            fingerprints, sort_keys=True
+        )) if fingerprints else ''
+        if cached:
+            self._fingerprint = fingerprint
+        return fingerprint or None
+
     def __eq__(self, other):
-        return self.dump() == other.dump()
+        if not isinstance(other, ItemBase):
+            return NotImplemented
+        return self.fingerprint(False) == other.fingerprint(False)
+
+    def __hash__(self):
+        return hash(self.fingerprint())
 
 
 class LinkItem(ItemBase):
@@ -105,6 +258,7 @@ class BasicInfo(ItemBase):
     marital_status = Field('marital_status', str)
     biography = Field('biography', str)
     hobbies = Field('hobbies', str)
+    photo = Field('photo', str)
 
 
 class ContactInfo(ItemBase):
@@ -195,4 +349,8 @@ class Model(ItemBase):
     languages = Field('languages', LanguageItem, is_list=True)
     courses = Field('courses', CourseItem, is_list=True)
     projects = Field('projects', ProjectItem, is_list=True)
-    skills = Field('skills', SkillItem, is_list=True)
+    skills = Field('skills', SkillItem, is_list=True, ordered=False)
+
+
+def _hash(data):
+    return hashlib.blake2b(data.encode('utf-8'), digest_size=16).hexdigest()
@@ -0,0 +1,98 @@
+import resumpy.model
+import resumpy.validator
+import collections
+import copy
+import jsonschema
+
+_validators = {}
+
+
+def apply_patch(item, patch, schema):
+    """Applies a JSON Merge Patch (RFC 7386) on top of a loaded model.
+
+    Only the subtrees touched by `patch` are validated, each one against its
+    matching sub-schema of `schema`. The returned model shares the fields
+    which are not touched by `patch` with `item`, instead of copying them.
+    As in RFC 7386, lists are replaced as a whole and `None` values remove
+    the corresponding field.
+
+    Args:
+        item (resumpy.model.ItemBase): loaded model, which is not modified.
+        patch (dict): merge patch to apply.
+        schema (dict): JSON schema of `item`.
+
+    Returns:
+        resumpy.model.ItemBase: new model with `patch` applied.
+
+    Raises:
+        jsonschema.ValidationError: if the patched model is not valid.
+    """
+    return _apply_patch(item, patch, schema, [])
+
+
+def merge_patch(target, patch):
+    """Applies a JSON Merge Patch (RFC 7386) on top of raw data.
+
+    Args:
+        target (object): raw data, which is not modified.
+        patch (object): merge patch to apply.
+
+    Returns:
+        object: patched raw data.
+    """
+    if not isinstance(patch, dict):
+        return patch
+    target = dict(target) if isinstance(target, dict) else {}
+    for key, value in patch.items():
+        if value is None:
+            target.pop(key, None)
+        else:
+            target[key] = merge_patch(target.get(key), value)
+    return target
+
+
+def _apply_patch(item, patch, schema, path):
+    patched_item = type(item)()
+    for attr in dir(item):
+        field = getattr(item, attr)
+        if not isinstance(field, resumpy.model.Field):
+            continue
+        if field.name not in patch:
+            setattr(patched_item, attr, field)
+            continue
+        value = patch[field.name]
+        field_schema = schema.get('properties', {}).get(field.name, {})
+        field_path = path + [field.name]
+        if value is None:
+            if field.name in schema.get('required', []):
+                raise jsonschema.ValidationError(
+                    '{!r} is a required property'.format(field.name),
+                    validator='required', path=collections.deque(path)
+                )
+            patched_field = copy.copy(field)
+            patched_field.value = None
+        elif isinstance(value, dict) and not field.is_list and \
+                issubclass(field.data_type, resumpy.model.ItemBase) and \
+                field.value is not None:
+            patched_field = copy.copy(field)
+            patched_field.value = _apply_patch(
+                field.value, value, field_schema, field_path
+            )
+        else:
+            value = merge_patch(field.dump(), value)
+            _validate(value, field_schema, field_path)
+            patched_field = copy.copy(field)
+            patched_field.load({field.name: value})
+        setattr(patched_item, attr, patched_field)
+    return patched_item
+
+
+def _validate(value, schema, path):
+    schema_hash = resumpy.validator.get_schema_hash(schema)
+    if schema_hash not in _validators:
+        _validators[schema_hash] = resumpy.validator.Validator(schema)
+    try:
+        _validators[schema_hash].validate(value)
+    except jsonschema.ValidationError as error:
+        error.path.extendleft(reversed(path))
+        raise
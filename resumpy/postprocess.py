@@ -0,0 +1,142 @@
+import os
+import shutil
+import subprocess
+
+try:
+    import pikepdf
+except ImportError:
+    pikepdf = None
+
+# pdfTeX settings producing compressed streams and object streams, added to
+# the preamble of the documents so that the PDF is already smaller before any
+# post-processing
+PDFTEX_COMPRESSION = r'''\ifdefined\pdfcompresslevel
+\pdfcompresslevel=9
+\pdfobjcompresslevel=2
+\fi'''
+
+# pdfTeX settings removing the creation dates and the trailer ID, which would
+# otherwise change on every compilation
+PDFTEX_DETERMINISTIC = r'''\ifdefined\pdftrailerid
+\pdftrailerid{}
+\pdfinfoomitdate=1
+\pdfsuppressptexinfo=-1
+\fi'''
+
+# Exit codes of qpdf when the output file has been written. qpdf exits with 3
+# when it succeeds with warnings, for instance after recovering a damaged file
+QPDF_SUCCESS_CODES = (0, 3)
+
+
+def get_backend():
+    """Returns the name of the library used to post-process PDF files.
+
+    Returns:
+        str: `pikepdf` if the Python package is installed, `qpdf` if the
+        command is available or `None` if none of them are.
+    """
+    if pikepdf is not None:
+        return 'pikepdf'
+    if shutil.which('qpdf') is not None:
+        return 'qpdf'
+    return None
+
+
+def optimize_pdf(pdf_path, logger, deterministic=False):
+    """Optimizes the size of a PDF file in place.
+
+    Unused resources are removed, streams are recompressed, objects are packed
+    into object streams and the file is linearized for fast web view. The
+    original file is only replaced if the optimized version is smaller.
+
+    Args:
+        pdf_path (str): path to the PDF file.
+        logger (logging.Logger): logger used to report the sizes.
+        deterministic (bool): whether to derive the trailer ID from the
+            content of the file, so that equal inputs give equal outputs.
+
+    Returns:
+        tuple of int: sizes of the file before and after the optimization, in
+        bytes.
+    """
+    size_before = os.path.getsize(pdf_path)
+    if size_before == 0:
+        logger.warning('{} is empty and can not be optimized.'.format(
+            os.path.basename(pdf_path)
+        ))
+        return size_before, size_before
+    backend = get_backend()
+    if backend is None:
+        logger.warning(
+            'Install pikepdf or qpdf to optimize the generated PDF files.'
+        )
+        return size_before, size_before
+
+    optimized_path = pdf_path + '.optimized'
+    if backend == 'pikepdf':
+        with pikepdf.open(pdf_path) as pdf:
+            save_optimized(pdf, optimized_path, deterministic)
+    else:
+        run_qpdf([
+            '--linearize', '--object-streams=generate',
+            '--compress-streams=y', '--recompress-flate',
+            '--remove-unreferenced-resources=yes'
+        ] + (['--deterministic-id'] if deterministic else []) + [
+            pdf_path, optimized_path
+        ])
+
+    size_after = os.path.getsize(optimized_path)
+    if size_after < size_before:
+        os.replace(optimized_path, pdf_path)
+    else:
+        os.remove(optimized_path)
+        size_after = size_before
+    logger.info('Optimized {}: {} -> {} bytes ({:.1%})'.format(
+        os.path.basename(pdf_path), size_before, size_after,
+        1 - size_after / size_before
+    ))
+    return size_before, size_after
+
+
+def run_qpdf(args):
+    """Runs qpdf, accepting the output files written with warnings.
+
+    Args:
+        args (list of str): arguments passed to qpdf.
+
+    Returns:
+        bytes: output of qpdf, including the warnings.
+
+    Raises:
+        subprocess.CalledProcessError: if qpdf fails with an exit code which
+            is not one of `QPDF_SUCCESS_CODES`.
+    """
+    process = subprocess.run(
+        ['qpdf'] + args, stdout=subprocess.PIPE, stderr=subprocess.STDOUT
+    )
+    if process.returncode not in QPDF_SUCCESS_CODES:
+        raise subprocess.CalledProcessError(
+            process.returncode, process.args, output=process.stdout
+        )
+    return process.stdout
+
+
+def save_optimized(pdf, pdf_path, deterministic=False):
+    """Saves an open `pikepdf.Pdf` applying the same optimizations as
+    `optimize_pdf`.
+
+    Useful to write PDF objects created in memory, for instance pages split
+    from a bigger document, without writing and reading them back.
+
+    Args:
+        pdf (pikepdf.Pdf): PDF document to save.
+        pdf_path (str): path where the PDF file is stored.
+        deterministic (bool): whether to derive the trailer ID from the
+            content of the file.
+    """
+    pdf.remove_unreferenced_resources()
+    pdf.save(
+        pdf_path, linearize=True, compress_streams=True,
+        recompress_flate=True, deterministic_id=deterministic,
+        object_stream_mode=pikepdf.ObjectStreamMode.generate
+    )
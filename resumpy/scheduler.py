@@ -0,0 +1,234 @@
+import collections
+import concurrent.futures
+import concurrent.futures.process
+import functools
+import os
+import threading
+import time
+
+# Priority classes, from highest to lowest priority
+PRIORITIES = ('interactive', 'batch')
+
+
+class QueueFullError(Exception):
+    """Raised when a job is rejected because its queue is full."""
+    priority = None
+    queued = None
+
+    def __init__(self, priority, queued):
+        super(QueueFullError, self).__init__(
+            'The {} queue is full ({} jobs waiting)'.format(priority, queued)
+        )
+        self.priority = priority
+        self.queued = queued
+
+
+class Scheduler:
+    """Runs jobs by priority class, sharing each class fairly among tenants.
+
+    Jobs of a lower priority class only start when no job of a higher class is
+    waiting, and `reserved_workers` workers are kept free for the highest
+    class, so that interactive jobs never wait for a whole batch to finish.
+    Inside each class, tenants are served in round robin, so that a tenant
+    submitting many jobs does not delay the jobs of the rest. Jobs submitted
+    when their queue already has `max_queued` jobs are rejected.
+
+    If a worker process dies, the jobs running in its pool fail, and the pool
+    is replaced with a new one created by `executor_factory`, so that the
+    next jobs run normally.
+
+    Attributes:
+        executor (concurrent.futures.Executor): executor running the jobs.
+        executor_factory (callable): function returning a new executor, used
+            to replace broken process pools.
+        max_workers (int): maximum number of jobs running at the same time.
+        reserved_workers (int): number of workers which only run jobs of the
+            highest priority class.
+        max_queued (dict): maximum number of waiting jobs of each priority
+            class.
+    """
+    executor = None
+    executor_factory = None
+    max_workers = None
+    reserved_workers = None
+    max_queued = None
+
+    def __init__(self, executor=None, max_workers=None, reserved_workers=None,
+                 max_queued=None, executor_factory=None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.executor_factory = executor_factory or functools.partial(
+            concurrent.futures.ProcessPoolExecutor, self.max_workers
+        )
+        self.executor = executor or self.executor_factory()
+        self.reserved_workers = reserved_workers \
+            if reserved_workers is not None else int(self.max_workers > 1)
+        self.max_queued = {'interactive': 4 * self.max_workers, 'batch': 1000}
+        self.max_queued.update(max_queued or {})
+        self._lock = threading.RLock()
+        self._queues = {p: collections.OrderedDict() for p in PRIORITIES}
+        self._running = 0
+        self._stats = {p: collections.Counter() for p in PRIORITIES}
+        self._executor_restarts = 0
+
+    def submit(self, fn, *args, priority='interactive', tenant=None,
+               **kwargs):
+        """Schedules `fn(*args, **kwargs)` to be run.
+
+        Args:
+            fn (callable): function to run. It must be picklable if the
+                executor runs it in another process.
+            *args: positional arguments of `fn`.
+            priority (str): priority class of the job, one of `PRIORITIES`.
+            tenant (str): identifier of the owner of the job.
+            **kwargs: keyword arguments of `fn`.
+
+        Returns:
+            concurrent.futures.Future: future of the result of `fn`.
+
+        Raises:
+            QueueFullError: if the queue of `priority` is full.
+        """
+        if priority not in PRIORITIES:
+            raise ValueError('Unknown priority {!r}'.format(priority))
+        future = concurrent.futures.Future()
+        with self._lock:
+            queued = self._get_queued(priority)
+            if queued >= self.max_queued[priority]:
+                self._stats[priority]['rejected'] += 1
+                raise QueueFullError(priority, queued)
+            self._queues[priority].setdefault(tenant, collections.deque())\
+                .append((future, fn, args, kwargs, time.perf_counter()))
+            self._stats[priority]['submitted'] += 1
+            self._dispatch()
+        return future
+
+    def metrics(self):
+        """Returns the state of the queues and the counters of each class.
+
+        Returns:
+            dict: number of `running` jobs, number of `executor_restarts`
+            after a worker process died and, for each priority class, the
+            number of `queued` jobs, the counters of `submitted`, `started`,
+            `completed`, `failed` and `rejected` jobs and the mean and maximum
+            time spent by the jobs in the queue, in seconds.
+        """
+        with self._lock:
+            metrics = {'running': self._running,
+                       'max_workers': self.max_workers,
+                       'executor_restarts': self._executor_restarts}
+            for priority in PRIORITIES:
+                stats = self._stats[priority]
+                metrics[priority] = {
+                    'queued': self._get_queued(priority),
+                    'tenants': len(self._queues[priority]),
+                    'submitted': stats['submitted'],
+                    'started': stats['started'],
+                    'completed': stats['completed'],
+                    'failed': stats['failed'],
+                    'rejected': stats['rejected'],
+                    'mean_wait': stats['wait'] / stats['started']
+                    if stats['started'] else 0,
+                    'max_wait': stats['max_wait']
+                }
+            return metrics
+
+    def shutdown(self, wait=True):
+        """Cancels the waiting jobs and shuts down the executor.
+
+        Args:
+            wait (bool): whether to wait for the running jobs to finish.
+        """
+        with self._lock:
+            for queues in self._queues.values():
+                for jobs in queues.values():
+                    for job in jobs:
+                        job[0].cancel()
+                queues.clear()
+        self.executor.shutdown(wait)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.shutdown()
+
+    def _get_queued(self, priority):
+        return sum(len(jobs) for jobs in self._queues[priority].values())
+
+    def _dispatch(self):
+        while True:
+            job = self._pop_next_job()
+            if job is None:
+                return
+            priority, (future, fn, args, kwargs, time_queued) = job
+            wait = time.perf_counter() - time_queued
+            stats = self._stats[priority]
+            stats['started'] += 1
+            stats['wait'] += wait
+            stats['max_wait'] = max(stats['max_wait'], wait)
+            self._running += 1
+            try:
+                try:
+                    executor_future = self.executor.submit(
+                        fn, *args, **kwargs
+                    )
+                except concurrent.futures.process.BrokenProcessPool:
+                    self._replace_executor(self.executor)
+                    executor_future = self.executor.submit(
+                        fn, *args, **kwargs
+                    )
+            except Exception as e:
+                self._running -= 1
+                stats['failed'] += 1
+                future.set_exception(e)
+                continue
+            executor_future.add_done_callback(functools.partial(
+                self._on_done, future, priority, self.executor
+            ))
+
+    def _replace_executor(self, broken_executor):
+        """Replaces `broken_executor` with a new executor, unless it has
+        already been replaced."""
+        with self._lock:
+            if self.executor is not broken_executor:
+                return
+            broken_executor.shutdown(wait=False)
+            self.executor = self.executor_factory()
+            self._executor_restarts += 1
+
+    def _pop_next_job(self):
+        for i, priority in enumerate(PRIORITIES):
+            max_running = self.max_workers - (
+                self.reserved_workers if i > 0 else 0
+            )
+            queues = self._queues[priority]
+            while self._running < max_running and queues:
+                tenant, jobs = next(iter(queues.items()))
+                job = jobs.popleft()
+                if jobs:
+                    queues.move_to_end(tenant)
+                else:
+                    del queues[tenant]
+                if job[0].set_running_or_notify_cancel():
+                    return priority, job
+        return None
+
+    def _on_done(self, future, priority, executor, executor_future):
+        if not executor_future.cancelled() and isinstance(
+                executor_future.exception(),
+                concurrent.futures.process.BrokenProcessPool
+        ):
+            self._replace_executor(executor)
+        with self._lock:
+            self._running -= 1
+            if executor_future.cancelled() or executor_future.exception():
+                self._stats[priority]['failed'] += 1
+            else:
+                self._stats[priority]['completed'] += 1
+            self._dispatch()
+        if executor_future.cancelled():
+            future.set_exception(concurrent.futures.CancelledError())
+        elif executor_future.exception() is not None:
+            future.set_exception(executor_future.exception())
+        else:
+            future.set_result(executor_future.result())
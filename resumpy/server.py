@@ -0,0 +1,315 @@
+import resumpy
+import resumpy.doctor
+import resumpy.fit
+import resumpy.scheduler
+import resumpy.theme
+import resumpy.themes
+import resumpy.validator
+import concurrent.futures
+import datetime
+import json
+import multiprocessing
+import os
+import shutil
+import socket
+import socketserver
+import stat
+import tempfile
+
+# Name of the socket of the server inside the runtime folder of the user
+SOCKET_NAME = 'resumpy.sock'
+
+
+class RenderServer(socketserver.ThreadingMixIn,
+                   socketserver.UnixStreamServer):
+    """Server generating CVs requested through a Unix domain socket.
+
+    Each request is a JSON object sent in a single line, answered with another
+    JSON object in a single line. Renders are queued in a
+    `resumpy.scheduler.Scheduler` and run by worker processes started by a
+    fork server which has already imported ResumPY and its dependencies. The
+    workers are not forked from the server itself, as forking a process
+    running several threads may leave the locks held by the other threads,
+    such as those of `logging`, locked forever in the child.
+    """
+    daemon_threads = True
+    cv_schema_path = None
+    logger = None
+    compiler = None
+    compiler_args = None
+    scheduler = None
+
+    def __init__(self, socket_path, cv_schema_path, logger, compiler=None,
+                 compiler_args=None, scheduler=None):
+        self.cv_schema_path = cv_schema_path
+        self.logger = logger
+        self.compiler = compiler
+        self.compiler_args = compiler_args
+        self.scheduler = scheduler or resumpy.scheduler.Scheduler(
+            executor_factory=create_executor
+        )
+        _remove_stale_socket(socket_path, logger)
+        super(RenderServer, self).__init__(socket_path, RenderHandler)
+
+    def warm_up(self, warm_tex=True):
+        """Loads everything needed to generate a CV before the first request.
+
+        Compiles the validator of the schema and formats the example CV with
+        every theme and language, which imports PyLaTeX and loads the
+        translations. The TeX installation is checked with
+        `resumpy.doctor.preflight`, reporting the themes which can not be
+        compiled. If `warm_tex` and `pdflatex` is installed, the example is
+        also compiled once, so that the TeX files are in the page cache.
+
+        Args:
+            warm_tex (bool): whether to run a warm-up LaTeX compilation.
+        """
+        base_path = os.path.dirname(os.path.dirname(__file__))
+        cv = resumpy.CV(self.logger)
+        cv.load(os.path.join(base_path, 'cv.example.json'),
+                self.cv_schema_path)
+        localedir = os.path.join(
+            os.path.dirname(__file__), 'themes', 'locale'
+        )
+        for theme_name in resumpy.themes.__themes_names__:
+            theme_obj = resumpy.theme.Theme.create_theme_by_name(
+                theme_name, self.logger
+            )
+            for lang in sorted(os.listdir(localedir)):
+                if os.path.isdir(os.path.join(localedir, lang)):
+                    cv.model.lang.value = lang
+                    theme_obj.format(cv.model)
+            try:
+                resumpy.doctor.preflight(theme_name, self.compiler)
+            except resumpy.doctor.PreflightError as e:
+                self.logger.warning('Renders of the {} theme will be refused:'
+                                    '\n{}'.format(theme_name, e))
+                continue
+            if warm_tex and shutil.which('pdflatex') is not None:
+                with tempfile.TemporaryDirectory() as tmp_dir:
+                    cv.generate(
+                        theme_name, os.path.join(tmp_dir, 'cv'), False,
+                        compiler=self.compiler,
+                        compiler_args=self.compiler_args
+                    )
+
+    def process(self, request):
+        """Processes a request.
+
+        Args:
+            request (dict): request received from the client. The `command`
+                `ping` checks that the server is alive, `metrics` returns the
+                metrics of the scheduler and `render` generates a CV. The
+                `priority` and `tenant` fields of `render` are used to
+                schedule it, and the rest are the arguments of the CLI:
+                `cv_file`, `overlay`, `theme`, `file_path`, `keep_tex`,
+                `optimize`, `lint`, `deterministic`, `reference_date`,
+                `max_pages`, `drop_order` and `photo_dpi`. Paths must be
+                absolute.
+
+        Returns:
+            dict: response sent to the client, with a `status` field which is
+            either `ok` or `error`.
+        """
+        if request.get('command') == 'ping':
+            return {'status': 'ok'}
+        if request.get('command') == 'metrics':
+            return {'status': 'ok', 'metrics': self.scheduler.metrics()}
+        if request.get('command') != 'render':
+            return {'status': 'error', 'error': 'Unknown command {!r}'.format(
+                request.get('command')
+            )}
+        try:
+            resumpy.doctor.preflight(request.get('theme'), self.compiler)
+            future = self.scheduler.submit(
+                render, request, self.cv_schema_path, self.logger,
+                self.compiler, self.compiler_args,
+                priority=request.get('priority') or 'interactive',
+                tenant=request.get('tenant')
+            )
+            return future.result()
+        except Exception as e:
+            return {'status': 'error', 'error': '{}: {}'.format(
+                type(e).__name__, e
+            )}
+
+    def server_close(self):
+        super(RenderServer, self).server_close()
+        self.scheduler.shutdown()
+        if os.path.exists(self.server_address):
+            os.remove(self.server_address)
+
+
+class RenderHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        try:
+            request = json.loads(self.rfile.readline().decode('utf-8'))
+            if not isinstance(request, dict):
+                raise ValueError('the request must be a JSON object')
+            response = self.server.process(request)
+        except ValueError as e:
+            response = {'status': 'error', 'error': 'Invalid request: {}'
+                        .format(e)}
+        self.wfile.write(json.dumps(response).encode('utf-8') + b'\n')
+
+
+def create_executor():
+    """Creates the pool of worker processes which run the renders.
+
+    Workers are started by a fork server, which imports ResumPY and its
+    dependencies once, so that each worker starts with them loaded.
+
+    Returns:
+        concurrent.futures.ProcessPoolExecutor: pool of `os.cpu_count()`
+        workers.
+    """
+    mp_context = multiprocessing.get_context('forkserver')
+    mp_context.set_forkserver_preload([
+        'resumpy', 'resumpy.server', 'resumpy.themes', 'pylatex'
+    ])
+    return concurrent.futures.ProcessPoolExecutor(
+        os.cpu_count(), mp_context=mp_context
+    )
+
+
+def render(request, cv_schema_path, logger, compiler=None,
+           compiler_args=None):
+    """Generates the CV described in a `render` request.
+
+    Args:
+        request (dict): request of the client. See `RenderServer.process`.
+        cv_schema_path (str): path to the schema used to validate the CV.
+        logger (logging.Logger): logger used during the generation.
+        compiler (str): LaTeX compiler to use.
+        compiler_args (list of str): extra arguments of `compiler`.
+
+    Returns:
+        dict: response sent to the client.
+    """
+    try:
+        cv = resumpy.CV(logger)
+        cv.load(request['cv_file'], cv_schema_path)
+        if request.get('overlay'):
+            cv = cv.apply_overlay(request['overlay'], cv_schema_path)
+        cv.generate(
+            request['theme'], request['file_path'],
+            request.get('keep_tex', False), request.get('optimize', False),
+            compiler=compiler, compiler_args=compiler_args,
+            lint=request.get('lint', 'reject'),
+            deterministic=request.get('deterministic', False),
+            reference_date=datetime.date.fromisoformat(
+                request['reference_date']
+            ) if request.get('reference_date') else None,
+            max_pages=request.get('max_pages'),
+            drop_order=request.get('drop_order') or resumpy.fit.DROP_ORDER,
+            photo_dpi=request.get('photo_dpi')
+        )
+    except (Exception, SystemExit) as e:
+        return {'status': 'error', 'error': '{}: {}'.format(
+            type(e).__name__, e
+        )}
+    return {'status': 'ok', 'file_path': request['file_path'] + '.pdf'}
+
+
+def serve(socket_path, cv_schema_path, logger, warm_tex=True, **kwargs):
+    """Starts a `RenderServer` and serves requests until interrupted.
+
+    Args:
+        socket_path (str): path of the Unix domain socket.
+        cv_schema_path (str): path to the schema used to validate the CVs.
+        logger (logging.Logger): logger used by the server.
+        warm_tex (bool): whether to run a warm-up LaTeX compilation.
+        **kwargs: extra arguments of `RenderServer`.
+    """
+    with RenderServer(socket_path, cv_schema_path, logger, **kwargs) as server:
+        server.warm_up(warm_tex)
+        logger.info('Listening on {}'.format(socket_path))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+def get_default_socket_path():
+    """Returns the default path of the socket of the server.
+
+    The socket is stored inside a `resumpy` folder which only the current
+    user can access, created inside `$XDG_RUNTIME_DIR` if set, or inside the
+    temporary folder otherwise.
+
+    Returns:
+        str: path of the socket.
+
+    Raises:
+        PermissionError: if the folder exists but is not a folder private to
+            the current user.
+    """
+    if os.environ.get('XDG_RUNTIME_DIR'):
+        runtime_dir = os.path.join(os.environ['XDG_RUNTIME_DIR'], 'resumpy')
+    else:
+        runtime_dir = os.path.join(
+            tempfile.gettempdir(), 'resumpy-{}'.format(os.getuid())
+        )
+    os.makedirs(runtime_dir, mode=0o700, exist_ok=True)
+    runtime_dir_stat = os.lstat(runtime_dir)
+    if not stat.S_ISDIR(runtime_dir_stat.st_mode) or \
+            runtime_dir_stat.st_uid != os.getuid() or \
+            runtime_dir_stat.st_mode & 0o077:
+        raise PermissionError(
+            '{} is not a folder private to the current user'.format(
+                runtime_dir
+            )
+        )
+    return os.path.join(runtime_dir, SOCKET_NAME)
+
+
+def send_request(socket_path, request, timeout=None):
+    """Sends a request to a running `RenderServer`.
+
+    Args:
+        socket_path (str): path of the Unix domain socket of the server.
+        request (dict): request to send. See `RenderServer.process`.
+        timeout (float): maximum time to wait for the response, in seconds.
+
+    Returns:
+        dict: response of the server.
+
+    Raises:
+        ConnectionError: if the server closes the connection without
+            replying.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        client.connect(socket_path)
+        client.sendall(json.dumps(request).encode('utf-8') + b'\n')
+        with client.makefile('rb') as response_file:
+            response = response_file.readline()
+    if not response.endswith(b'\n'):
+        raise ConnectionError(
+            'The server at {} closed the connection without replying'.format(
+                socket_path
+            )
+        )
+    return json.loads(response.decode('utf-8'))
+
+
+def _remove_stale_socket(socket_path, logger):
+    """Removes the socket left at `socket_path` by a server which is not
+    running anymore. Any other file is left untouched."""
+    try:
+        socket_stat = os.lstat(socket_path)
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(socket_stat.st_mode) or \
+            socket_stat.st_uid != os.getuid():
+        logger.error('{} is not a socket owned by the current user.'.format(
+            socket_path
+        ))
+        exit()
+    try:
+        send_request(socket_path, {'command': 'ping'}, timeout=1)
+    except OSError:
+        os.remove(socket_path)
+        return
+    logger.error('A server is already listening on {}.'.format(socket_path))
+    exit()
@@ -1,11 +1,21 @@
 import gettext
 import os
+import pylatex
 
 
 class Theme:
     theme_name = None
     logger = None
     doc = None
+    reference_date = None
+    spacing = 1
+    photo_path = None
+    photo_size = 1.5
+    photo_dpi = 300
+
+    # Internal macros defined only once per document by the class of the
+    # theme, which have to be reset to typeset several CVs in one document
+    reset_macros = []
 
     def __init__(self, theme_name, logger):
         self.theme_name = theme_name
@@ -44,6 +54,35 @@ class Theme:
         """
         raise NotImplementedError
 
+    def estimate_pages(self, model):
+        """Estimates the number of pages of the document of `model`.
+
+        The estimation is computed from the length of the content, without
+        running LaTeX, and is used to choose which content to trim when the
+        document has to fit in a maximum number of pages. This method must be
+        implemented by the different individual themes.
+
+        Returns:
+            float: estimated number of pages, where the fractional part is the
+            filled part of the last page.
+        """
+        raise NotImplementedError
+
+    def format_spacing(self):
+        """Returns the LaTeX code scaling the vertical skips of the document
+        by `self.spacing`.
+
+        Returns:
+            pylatex.NoEscape: LaTeX code to add to the preamble.
+        """
+        return pylatex.NoEscape('\n'.join(
+            '\\setlength{{\\{}skipamount}}{{{:g}pt plus {:g}pt minus '
+            '{:g}pt}}'.format(
+                name, amount * self.spacing, amount / 3 * self.spacing,
+                amount / 3 * self.spacing
+            ) for name, amount in [('small', 3), ('med', 6), ('big', 12)]
+        ))
+
     @staticmethod
     def create_theme_by_name(theme_name, logger):
         """Returns a theme object given its name.
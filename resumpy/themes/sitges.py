@@ -1,11 +1,23 @@
 import resumpy
+import resumpy.markdown
 import resumpy.theme
 import resumpy.utils
 import gettext
+import math
+import os
 import pylatex
 import pylatex.lists
 from pylatex import Command, UnsafeCommand
 
+# Approximate layout of the theme, in points, used to estimate the length of
+# the documents without running LaTeX. Font sizes are given as (size, line
+# height) and characters are assumed to be half as wide as the font size
+TEXT_HEIGHT = 745
+COLUMN_WIDTHS = (327, 192)
+HEADER_HEIGHT = 60
+FONT_SIZES = {'footnotesize': (8, 9.5), 'small': (9, 11),
+              'normalsize': (10, 12), 'Large': (14.4, 18)}
+
 
 class ThemeSitges(resumpy.theme.Theme):
     class Paracol(pylatex.base_classes.Environment):
@@ -39,12 +51,23 @@ class ThemeSitges(resumpy.theme.Theme):
         def dumps(self):
             return self.dumps_content()
 
+    reset_macros = [
+        '@name', '@profession', '@email', '@location', '@scholarurl',
+        '@scholarlabel', '@githuburl', '@githublabel', '@linkedinurl',
+        '@linkedinlabel', '@twitterurl', '@twitterlabel', '@websiteurl',
+        '@websitelabel'
+    ]
+
+    photo_size = 1.6
+
     def __init__(self, logger):
         super(ThemeSitges, self).__init__('sitges', logger)
 
     def format(self, model):
         self.set_lang(model)
         doc = pylatex.Document(documentclass=self.theme_name)
+        if self.spacing != 1:
+            doc.preamble.append(self.format_spacing())
         doc += self._format_last_update(model)
         doc += self._format_basic(model)
         doc.append(Command('columnratio', '0.63'))
@@ -71,6 +94,86 @@ class ThemeSitges(resumpy.theme.Theme):
                 doc += self._format_hobbies(model)
         return doc
 
+    def estimate_pages(self, model):
+        skip = {'small': 3 * self.spacing, 'med': 6 * self.spacing,
+                'big': 12 * self.spacing}
+        section = 2 * skip['med'] + FONT_SIZES['Large'][1]
+        sidebar_section = skip['big'] + skip['med'] + \
+            FONT_SIZES['normalsize'][1]
+        left, right = HEADER_HEIGHT, sidebar_section
+
+        # Main column
+        for item in model.get('experience') or []:
+            left += self._estimate_height(
+                item.get('position') + ' @ ' + item.get('institution'),
+                'normalsize', 0
+            ) + FONT_SIZES['footnotesize'][1] + skip['med'] + skip['big'] + \
+                self._estimate_rich_text(item.get('description'))
+        for item in model.get('education') or []:
+            left += FONT_SIZES['small'][1] + FONT_SIZES['footnotesize'][1] + \
+                self._estimate_height(item.get('degree'), 'normalsize', 0) + \
+                skip['med'] + skip['big'] + \
+                self._estimate_rich_text(item.get('description'))
+        for item in model.get('publications') or []:
+            left += 2 * FONT_SIZES['footnotesize'][1] + skip['med'] + \
+                self._estimate_height(item.get('title'), 'normalsize', 0)
+        for item in model.get('awards') or []:
+            left += self._estimate_height(item.get('name'), 'normalsize', 0) \
+                + FONT_SIZES['footnotesize'][1] + skip['small'] + \
+                skip['big'] + self._estimate_height(
+                    item.get('description'), 'footnotesize', 0
+                )
+        left += section * sum(1 for s in ['experience', 'education',
+                                          'publications', 'awards']
+                              if model.get(s))
+
+        # Sidebar column
+        if self.photo_path:
+            right += self.photo_size * 72 + skip['med']
+        for value in [model.get('contact', 'email'),
+                      model.get('contact', 'phone'),
+                      model.get('basic', 'birthday'),
+                      model.get('basic', 'birthplace'),
+                      model.get('basic', 'residence')]:
+            if value:
+                right += FONT_SIZES['small'][1] + skip['med'] + \
+                    self._estimate_height(value, 'small', 1)
+        for item in model.get('languages') or []:
+            right += FONT_SIZES['footnotesize'][1] + 6 + skip['med']
+        for item in model.get('courses') or []:
+            right += self._estimate_height(item.get('name'), 'normalsize', 1) \
+                + skip['med'] + self._estimate_height(
+                    '{} - {}'.format(item.get('institution'), item.get(
+                        'diploma', 'anchor') if item.get('diploma') else ''),
+                    'footnotesize', 1
+                )
+        if model.get('skills'):
+            for category in resumpy.utils.get_skills_categories(
+                    model.get('skills')
+            ):
+                right += FONT_SIZES['small'][1] + skip['small'] + \
+                    skip['med'] + self._estimate_height(', '.join(
+                        s.get('name') for s in
+                        resumpy.utils.filter_skills_by_category(
+                            model.get('skills'), category
+                        )
+                    ), 'footnotesize', 1)
+        for item in model.get('projects') or []:
+            right += self._estimate_height(item.get('name'), 'normalsize', 1) \
+                + FONT_SIZES['footnotesize'][1] + skip['small'] + \
+                skip['big'] + self._estimate_height(
+                    item.get('description'), 'footnotesize', 1
+                )
+        if model.get('basic', 'hobbies'):
+            right += self._estimate_height(
+                model.get('basic', 'hobbies'), 'footnotesize', 1
+            )
+        right += sidebar_section * sum(
+            1 for s in ['languages', 'courses', 'skills', 'projects']
+            if model.get(s)
+        ) + sidebar_section * bool(model.get('basic', 'hobbies'))
+        return max(left, right) / TEXT_HEIGHT
+
     def _format_last_update(self, model):
         last_update = gettext.gettext('SITGES_LAST_UPDATE_LABEL') + ' ' + \
                       model.get('last_update').strftime('%B %Y')
@@ -243,34 +346,42 @@ class ThemeSitges(resumpy.theme.Theme):
         return awards_items
 
     def _format_info(self, model):
-        info_items = [
+        # The photo is copied next to the document, see `resumpy.CV.generate`,
+        # as the cache folder may contain characters which are special in LaTeX
+        info_items = [Command('photo', [
+            pylatex.NoEscape(os.path.basename(self.photo_path)),
+            pylatex.NoEscape('{}in'.format(self.photo_size))
+        ])] if self.photo_path else []
+        info_items += [
             Command('cvsidebarsection', ''),
             Command('detailitem', [
-                '\\faEnvelope',
+                pylatex.NoEscape('\\faEnvelope'),
                 gettext.gettext('SITGES_EMAIL_LABEL'),
                 model.get('contact', 'email')
             ]),
             Command('detailitem', [
-                '\\faPhone',
+                pylatex.NoEscape('\\faPhone'),
                 gettext.gettext('SITGES_PHONE_LABEL'),
                 model.get('contact', 'phone')
             ])
         ]
         if model.get('basic', 'birthday'):
             info_items.append(Command('detailitem', [
-                '\\faCalendar',
+                pylatex.NoEscape('\\faCalendar'),
                 gettext.gettext('SITGES_AGE_LABEL'),
-                resumpy.utils.get_age(model.get('basic', 'birthday'))
+                resumpy.utils.get_age(
+                    model.get('basic', 'birthday'), self.reference_date
+                )
             ]))
         if model.get('basic', 'birthplace'):
             info_items.append(Command('detailitem', [
-                '\\faGlobe',
+                pylatex.NoEscape('\\faGlobe'),
                 gettext.gettext('SITGES_NATIONALITY_LABEL'),
                 model.get('basic', 'birthplace')
             ]))
         if model.get('basic', 'residence'):
             info_items.append(Command('detailitem', [
-                '\\faFlag',
+                pylatex.NoEscape('\\faFlag'),
                 gettext.gettext('SITGES_LOCATION_LABEL'),
                 model.get('basic', 'residence')
             ]))
@@ -361,6 +472,39 @@ class ThemeSitges(resumpy.theme.Theme):
             Command('footnotesize', model.get('basic', 'hobbies'))
         ]
 
+    def _estimate_rich_text(self, rich_text_items):
+        height = 0
+        for item in rich_text_items or []:
+            if item.get('type') == 'paragraph':
+                height += self._estimate_height(
+                    item.get('content'), 'footnotesize', 0
+                )
+            elif item.get('type') == 'itemize':
+                height += 2 * self.spacing * 4 + sum(
+                    self._estimate_height(i, 'footnotesize', 0) + 2
+                    for i in item.get('content')
+                )
+            elif item.get('type') == 'markdown':
+                bullets = len([
+                    line for line in item.get('content').split('\n')
+                    if resumpy.markdown.LIST_ITEM_REGEX.match(line)
+                ])
+                height += self._estimate_height(
+                    item.get('content'), 'footnotesize', 0
+                ) + 2 * bullets + (2 * self.spacing * 4 if bullets else 0)
+        return height
+
+    @staticmethod
+    def _estimate_height(text, size, column):
+        """Estimates the height of `text` written with the font `size` in
+        the main (`column=0`) or the sidebar (`column=1`) column."""
+        font_size, line_height = FONT_SIZES[size]
+        line_length = COLUMN_WIDTHS[column] / (font_size / 2)
+        return line_height * sum(
+            math.ceil(len(line) / line_length)
+            for line in str(text or '').split('\n') if line.strip()
+        )
+
     def _format_rich_text(self, rich_text_items):
         container = self.MultiCommandContainer()
         if rich_text_items is None:
@@ -373,4 +517,8 @@ class ThemeSitges(resumpy.theme.Theme):
                 for itemize_item in item.get('content'):
                     itemize.add_item(itemize_item)
                 container.append(itemize)
+            elif item.get('type') == 'markdown':
+                container.append(pylatex.NoEscape(
+                    resumpy.markdown.to_latex(item.get('content'))
+                ))
         return container
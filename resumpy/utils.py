@@ -1,8 +1,19 @@
+import contextlib
 import datetime
+import os
 
 
 def escape_link(href):
-    _latex_special_chars = {'%': r'\%'}
+    """Escapes the characters of a link which are special inside the
+    argument of `\\href` when it is nested in another command.
+
+    Args:
+        href (str): link to escape.
+
+    Returns:
+        str: escaped link.
+    """
+    _latex_special_chars = {'%': r'\%', '#': r'\#'}
     return ''.join(_latex_special_chars.get(c, c) for c in str(href))
 
 
@@ -16,13 +27,18 @@ def get_language_score(language_level):
             'Native': 100}[language_level]
 
 
-def get_age(birthday):
+def get_age(birthday, reference_date=None):
     """Converts the birthdate into an age.
 
+    Args:
+        birthday (datetime.date): birthdate of the person.
+        reference_date (datetime.date): date at which the age is computed.
+            Defaults to today.
+
     Returns:
         int: age of the person.
     """
-    today = datetime.date.today()
+    today = reference_date or datetime.date.today()
     return today.year - birthday.year - (
             (today.month, today.day) < (birthday.month, birthday.day)
     )
@@ -59,3 +75,43 @@ def filter_skills_by_category(skills, category):
     return [
         s for s in skills if category is None or s.get('category') == category
     ]
+
+
+def get_cache_dir(*paths):
+    """Returns a folder inside the cache of ResumPY, creating it if needed.
+
+    The cache is stored inside `$RESUMPY_CACHE_DIR` if set, otherwise inside
+    `$XDG_CACHE_HOME/resumpy` or `~/.cache/resumpy`.
+
+    Args:
+        *paths (str): components of the path relative to the cache folder.
+
+    Returns:
+        str: absolute path of the folder.
+    """
+    cache_dir = os.environ.get('RESUMPY_CACHE_DIR') or os.path.join(
+        os.environ.get('XDG_CACHE_HOME') or
+        os.path.join(os.path.expanduser('~'), '.cache'), 'resumpy'
+    )
+    cache_dir = os.path.abspath(os.path.join(cache_dir, *paths))
+    os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
+
+
+@contextlib.contextmanager
+def set_environ(variables):
+    """Sets environment variables inside a `with` block.
+
+    Args:
+        variables (dict): names and values of the variables to set.
+    """
+    previous_values = {name: os.environ.get(name) for name in variables}
+    os.environ.update(variables)
+    try:
+        yield
+    finally:
+        for name, value in previous_values.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
@@ -0,0 +1,380 @@
+import resumpy.utils
+import hashlib
+import importlib.util
+import json
+import jsonschema
+import os
+import tempfile
+
+# Increase when the generated code changes, so that cached files are rebuilt
+GENERATOR_VERSION = 1
+
+# Keywords that the generator does not know how to compile. Schemas using
+# them are validated with `jsonschema` instead
+UNSUPPORTED_KEYWORDS = {
+    '$ref', 'allOf', 'anyOf', 'oneOf', 'not', 'if', 'then', 'else',
+    'dependencies', 'patternProperties', 'propertyNames', 'contains',
+    'additionalItems', 'multipleOf'
+}
+
+TYPE_CHECKS = {
+    'string': 'isinstance({0}, str)',
+    'number': '(isinstance({0}, (int, float)) and '
+              'not isinstance({0}, bool))',
+    'integer': '(isinstance({0}, int) and not isinstance({0}, bool) or '
+               'isinstance({0}, float) and {0}.is_integer())',
+    'boolean': 'isinstance({0}, bool)',
+    'object': 'isinstance({0}, dict)',
+    'array': 'isinstance({0}, list)',
+    'null': '{0} is None'
+}
+
+_validators = {}
+
+
+class Validator:
+    """Validates instances against a JSON schema using generated code.
+
+    The schema is compiled into a plain-Python function which only checks
+    whether an instance is valid. When it is not, `jsonschema` is run on it to
+    raise exactly the same `jsonschema.ValidationError` that
+    `jsonschema.validate` would raise. If the schema uses keywords that can
+    not be compiled, `jsonschema` is used for every instance.
+    """
+    schema = None
+    validate_fn = None
+    jsonschema_validator = None
+
+    def __init__(self, schema, cache_dir=None):
+        cls = jsonschema.validators.validator_for(schema)
+        cls.check_schema(schema)
+        self.schema = schema
+        self.jsonschema_validator = cls(schema)
+        if cls in [jsonschema.Draft6Validator, jsonschema.Draft7Validator]:
+            try:
+                self.validate_fn = load_compiled(schema, cache_dir)
+            except NotImplementedError:
+                self.validate_fn = None
+
+    def is_valid(self, instance):
+        """Returns whether `instance` is valid.
+
+        Args:
+            instance (object): instance to validate.
+
+        Returns:
+            bool: whether `instance` is valid according to the schema.
+        """
+        if self.validate_fn is None:
+            return self.jsonschema_validator.is_valid(instance)
+        return self.validate_fn(instance)
+
+    def validate(self, instance):
+        """Validates `instance`, with the same semantics as
+        `jsonschema.validate`.
+
+        Args:
+            instance (object): instance to validate.
+
+        Raises:
+            jsonschema.ValidationError: if `instance` is not valid.
+        """
+        if self.validate_fn is not None and self.validate_fn(instance):
+            return
+        error = jsonschema.exceptions.best_match(
+            self.jsonschema_validator.iter_errors(instance)
+        )
+        if error is not None:
+            raise error
+
+
+def get_validator(cv_schema_path):
+    """Returns the validator of the schema stored in `cv_schema_path`.
+
+    Validators are cached in memory, and rebuilt if the file changes.
+
+    Args:
+        cv_schema_path (str): path to the JSON schema file.
+
+    Returns:
+        Validator: validator of the schema.
+    """
+    cache_key = (
+        os.path.abspath(cv_schema_path), os.path.getmtime(cv_schema_path)
+    )
+    if cache_key not in _validators:
+        with open(cv_schema_path) as schema_file:
+            _validators[cache_key] = Validator(json.load(schema_file))
+    return _validators[cache_key]
+
+
+def get_schema_hash(schema):
+    """Returns the hash identifying the compiled version of `schema`.
+
+    Args:
+        schema (dict): JSON schema.
+
+    Returns:
+        str: hexadecimal hash of the schema and the generator version.
+    """
+    return hashlib.sha256('{}:{}'.format(
+        GENERATOR_VERSION, json.dumps(schema, sort_keys=True)
+    ).encode()).hexdigest()
+
+
+def load_compiled(schema, cache_dir=None):
+    """Returns the compiled validation function of `schema`.
+
+    The generated module is stored inside the cache folder, named after the
+    hash of the schema, so that it is only generated once and its bytecode is
+    cached by Python. If the cache folder is not writable, the module is
+    compiled in memory.
+
+    Args:
+        schema (dict): JSON schema.
+        cache_dir (str): folder where generated modules are stored. Defaults
+            to the `validators` folder inside the cache of ResumPY.
+
+    Returns:
+        callable: function returning whether an instance is valid.
+
+    Raises:
+        NotImplementedError: if the schema can not be compiled.
+    """
+    module_name = 'resumpy_validator_' + get_schema_hash(schema)[:16]
+    try:
+        cache_dir = cache_dir or resumpy.utils.get_cache_dir('validators')
+        module_path = os.path.join(cache_dir, module_name + '.py')
+        if not os.path.exists(module_path):
+            source = compile_schema(schema)
+            with tempfile.NamedTemporaryFile(
+                    'wt', dir=cache_dir, suffix='.tmp', delete=False
+            ) as module_file:
+                module_file.write(source)
+            os.replace(module_file.name, module_path)
+        spec = importlib.util.spec_from_file_location(module_name, module_path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module.validate
+    except OSError:
+        module_globals = {}
+        exec(compile(compile_schema(schema), module_name, 'exec'),
+             module_globals)
+        return module_globals['validate']
+
+
+def compile_schema(schema):
+    """Generates the source code of a module validating `schema`.
+
+    The module defines a function `validate(instance)` which returns whether
+    `instance` is valid, following the semantics of Draft 7 of JSON Schema.
+
+    Args:
+        schema (dict): JSON schema.
+
+    Returns:
+        str: source code of the module.
+
+    Raises:
+        NotImplementedError: if the schema uses an unsupported keyword.
+    """
+    generator = _CodeGenerator()
+    body = generator.node(schema, 'v0', 0)
+    lines = [
+        '# Generated by resumpy.validator. Do not edit.',
+        'import re',
+        'from resumpy.validator import _enum, _unique',
+        ''
+    ]
+    lines += ['{} = {}'.format(name, src) for name, src in generator.constants]
+    lines += ['', '', 'def validate(v0):']
+    lines += ['    ' + line for line in body + ['return True']]
+    return '\n'.join(lines) + '\n'
+
+
+class _CodeGenerator:
+    constants = None
+
+    def __init__(self):
+        self.constants = []
+
+    def constant(self, src):
+        for name, constant_src in self.constants:
+            if constant_src == src:
+                return name
+        name = '_c{}'.format(len(self.constants))
+        self.constants.append((name, src))
+        return name
+
+    def node(self, schema, var, depth):
+        """Returns the lines of code validating `var` against `schema`."""
+        if schema is True:
+            return []
+        if schema is False:
+            return ['return False']
+        unsupported = UNSUPPORTED_KEYWORDS.intersection(schema)
+        if unsupported or isinstance(schema.get('items'), list):
+            raise NotImplementedError(
+                'Unsupported keywords: {}'.format(unsupported or 'items')
+            )
+        lines, known_type = [], None
+        if 'type' in schema:
+            types = schema['type'] if isinstance(schema['type'], list) \
+                else [schema['type']]
+            lines += self.check(' or '.join(
+                TYPE_CHECKS[type_name].format(var) for type_name in types
+            ), negate=True)
+            known_type = types[0] if len(types) == 1 else None
+        if 'enum' in schema:
+            lines += self.check('_enum({}, {!r})'.format(
+                var, schema['enum']
+            ), negate=True)
+        if 'const' in schema:
+            lines += self.check('_enum({}, [{!r}])'.format(
+                var, schema['const']
+            ), negate=True)
+        self.guard(lines, var, 'string', known_type, self.string(schema, var))
+        self.guard(lines, var, 'number', known_type, self.number(schema, var))
+        self.guard(
+            lines, var, 'object', known_type, self.object(schema, var, depth)
+        )
+        self.guard(
+            lines, var, 'array', known_type, self.array(schema, var, depth)
+        )
+        return lines
+
+    def string(self, schema, var):
+        lines = []
+        if 'pattern' in schema:
+            pattern = self.constant('re.compile({!r})'.format(
+                schema['pattern']
+            ))
+            lines += self.check('{}.search({})'.format(pattern, var), True)
+        if 'minLength' in schema:
+            lines += self.check('len({}) < {!r}'.format(
+                var, schema['minLength']
+            ))
+        if 'maxLength' in schema:
+            lines += self.check('len({}) > {!r}'.format(
+                var, schema['maxLength']
+            ))
+        return lines
+
+    def number(self, schema, var):
+        lines = []
+        for keyword, operator in [
+            ('minimum', '<'), ('maximum', '>'), ('exclusiveMinimum', '<='),
+            ('exclusiveMaximum', '>=')
+        ]:
+            if keyword in schema:
+                lines += self.check('{} {} {!r}'.format(
+                    var, operator, schema[keyword]
+                ))
+        return lines
+
+    def object(self, schema, var, depth):
+        lines, sub_var = [], 'v{}'.format(depth + 1)
+        for key in schema.get('required', []):
+            lines += self.check('{!r} not in {}'.format(key, var))
+        if 'minProperties' in schema:
+            lines += self.check('len({}) < {!r}'.format(
+                var, schema['minProperties']
+            ))
+        if 'maxProperties' in schema:
+            lines += self.check('len({}) > {!r}'.format(
+                var, schema['maxProperties']
+            ))
+        properties = schema.get('properties', {})
+        for key, sub_schema in properties.items():
+            sub_lines = self.node(sub_schema, sub_var, depth + 1)
+            if sub_lines:
+                lines.append('if {!r} in {}:'.format(key, var))
+                lines.append('    {} = {}[{!r}]'.format(sub_var, var, key))
+                lines += ['    ' + line for line in sub_lines]
+        additional = schema.get('additionalProperties', True)
+        if additional is not True:
+            sub_lines = self.node(additional, sub_var, depth + 1)
+            if sub_lines:
+                keys = self.constant('frozenset({!r})'.format(
+                    sorted(properties)
+                ))
+                lines.append('for k{}, {} in {}.items():'.format(
+                    depth, sub_var, var
+                ))
+                lines.append('    if k{} not in {}:'.format(depth, keys))
+                lines += ['        ' + line for line in sub_lines]
+        return lines
+
+    def array(self, schema, var, depth):
+        lines, sub_var = [], 'v{}'.format(depth + 1)
+        if 'minItems' in schema:
+            lines += self.check('len({}) < {!r}'.format(
+                var, schema['minItems']
+            ))
+        if 'maxItems' in schema:
+            lines += self.check('len({}) > {!r}'.format(
+                var, schema['maxItems']
+            ))
+        if 'items' in schema:
+            sub_lines = self.node(schema['items'], sub_var, depth + 1)
+            if sub_lines:
+                lines.append('for {} in {}:'.format(sub_var, var))
+                lines += ['    ' + line for line in sub_lines]
+        if schema.get('uniqueItems'):
+            lines += self.check('_unique({})'.format(var), negate=True)
+        return lines
+
+    @staticmethod
+    def check(condition, negate=False):
+        return [
+            'if {}:'.format('not ({})'.format(condition) if negate
+                            else condition),
+            '    return False'
+        ]
+
+    @staticmethod
+    def guard(lines, var, type_name, known_type, body):
+        if not body:
+            return
+        if known_type == type_name or \
+                type_name == 'number' and known_type == 'integer':
+            lines += body
+        else:
+            lines.append('if {}:'.format(TYPE_CHECKS[type_name].format(var)))
+            lines += ['    ' + line for line in body]
+
+
+class _Unbooled:
+    def __init__(self, value):
+        self.value = value
+
+    def __eq__(self, other):
+        return isinstance(other, _Unbooled) and self.value is other.value
+
+
+def _unbool(value):
+    return _Unbooled(value) if isinstance(value, bool) else value
+
+
+def _enum(instance, values):
+    instance = _unbool(instance)
+    return any(instance == _unbool(value) for value in values)
+
+
+def _unique(instance):
+    seen = set()
+    for item in instance:
+        item = (_Unbooled, item) if isinstance(item, bool) \
+            else _freeze(item)
+        if item in seen:
+            return False
+        seen.add(item)
+    return True
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return frozenset((key, _freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
@@ -0,0 +1,113 @@
+import resumpy.index
+import resumpy.model
+import argparse
+import datetime
+import random
+import tempfile
+import time
+
+parser = argparse.ArgumentParser(description='Benchmark resumpy.index')
+parser.add_argument(
+    '--size', type=int, default=100000, help='Number of CVs in the corpus'
+)
+parser.add_argument(
+    '--distinct', type=int, default=2000,
+    help='Number of distinct synthetic models the corpus is built from'
+)
+parser.add_argument(
+    '--queries', type=int, default=1000, help='Number of queries to time'
+)
+args = parser.parse_args()
+
+random.seed(0)
+skills = ['Skill {}'.format(i) for i in range(500)]
+categories = ['Category {}'.format(i) for i in range(20)]
+institutions = ['Institution {}'.format(i) for i in range(2000)]
+languages = ['Language {}'.format(i) for i in range(40)]
+levels = ['A1', 'A2', 'B1', 'B2', 'C1', 'C2', 'Native']
+
+
+def random_date(year_min=2000, year_max=2020):
+    return datetime.date(
+        random.randint(year_min, year_max), random.randint(1, 12), 1
+    )
+
+
+def random_model():
+    experience = []
+    for _ in range(random.randint(1, 6)):
+        date_start = random_date()
+        experience.append({
+            'institution': random.choice(institutions),
+            'position': 'Position',
+            'date_start': date_start.isoformat(),
+            'date_end': date_start.replace(
+                year=date_start.year + random.randint(0, 4)
+            ).isoformat()
+        })
+    return resumpy.model.Model({
+        'lang': 'en',
+        'last_update': '2020-01-01',
+        'basic': {'name': 'Name', 'surnames': 'Surnames', 'profession': 'P'},
+        'contact': {'email': 'name@example.com', 'phone': '000'},
+        'experience': experience,
+        'languages': [
+            {'name': language, 'level': random.choice(levels)}
+            for language in random.sample(languages, random.randint(1, 4))
+        ],
+        'skills': [
+            {'name': skill, 'category': random.choice(categories)}
+            for skill in random.sample(skills, random.randint(5, 30))
+        ]
+    })
+
+
+def timeit(label, fn, repeat=1):
+    time_start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    elapsed = (time.perf_counter() - time_start) / repeat
+    print('{:<40} {:>10.3f} ms'.format(label, elapsed * 1000))
+    return result
+
+
+models = [random_model() for _ in range(args.distinct)]
+corpus = [('cv-{}'.format(i), models[i % len(models)])
+          for i in range(args.size)]
+index = timeit('Build ({} CVs)'.format(args.size),
+               lambda: resumpy.index.CorpusIndex.build(corpus))
+
+with tempfile.TemporaryDirectory() as index_path:
+    timeit('Save', lambda: index.save(index_path))
+    index = timeit('Load (memory-mapped)',
+                   lambda: resumpy.index.CorpusIndex.load(index_path))
+    queries = [dict(
+        skill=random.choice(skills), category=random.choice(categories),
+        institution=random.choice(institutions),
+        after=random_date(2015, 2020), language=random.choice(languages),
+        min_level=random.choice(levels)
+    ) for _ in range(args.queries)]
+    for label, keys in [
+        ('skill', ['skill']),
+        ('skill + category', ['skill', 'category']),
+        ('institution + after', ['institution', 'after']),
+        ('after', ['after']),
+        ('language + min_level', ['language', 'min_level']),
+        ('all conditions', list(queries[0].keys()))
+    ]:
+        time_start = time.perf_counter()
+        for q in queries:
+            index.query(**{key: q[key] for key in keys})
+        elapsed = (time.perf_counter() - time_start) / len(queries)
+        print('{:<40} {:>10.3f} ms'.format(
+            'Query: ' + label + ' (mean)', elapsed * 1000
+        ))
+
+    # Linear scan over the models, as a reference
+    query = queries[0]
+    timeit('Linear scan: all conditions', lambda: [
+        doc_id for doc_id, model in corpus
+        if any(s.get('name') == query['skill'] and
+               s.get('category') == query['category']
+               for s in model.get('skills') or [])
+    ])
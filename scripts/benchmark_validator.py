@@ -0,0 +1,56 @@
+import resumpy.validator
+import argparse
+import copy
+import json
+import jsonschema
+import os
+import time
+
+parser = argparse.ArgumentParser(description='Benchmark resumpy.validator')
+parser.add_argument(
+    '--repeat', type=int, default=200, help='Number of validations to time'
+)
+parser.add_argument(
+    '--scale', type=int, default=50,
+    help='Number of copies of each section in the synthetic large CV'
+)
+args = parser.parse_args()
+
+base_path = os.path.dirname(os.path.dirname(__file__))
+with open(os.path.join(base_path, 'cv.schema.json')) as schema_file:
+    schema = json.load(schema_file)
+with open(os.path.join(base_path, 'cv.example.json')) as cv_file:
+    cv_example = json.load(cv_file)
+
+# Large synthetic CV, with distinct items so that `uniqueItems` holds
+cv_large = copy.deepcopy(cv_example)
+for section in ['experience', 'education', 'awards', 'publications',
+                'languages', 'courses', 'projects', 'skills']:
+    cv_large[section] = []
+    for i in range(args.scale):
+        for item in cv_example.get(section, []):
+            item = copy.deepcopy(item)
+            key = next(k for k in ['name', 'title', 'position', 'degree']
+                       if k in item)
+            item[key] += ' {}'.format(i)
+            cv_large[section].append(item)
+
+jsonschema_validator = jsonschema.validators.validator_for(schema)(schema)
+validator = resumpy.validator.Validator(schema)
+for cv_name, cv_raw in [('cv.example.json', cv_example),
+                        ('synthetic x{}'.format(args.scale), cv_large)]:
+    repeat = args.repeat if cv_raw is cv_example else max(args.repeat // 20, 1)
+    for label, validate_fn in [
+        ('jsonschema.validate',
+         lambda: jsonschema.validate(cv_raw, schema)),
+        ('jsonschema (cached validator)',
+         lambda: jsonschema_validator.validate(cv_raw)),
+        ('resumpy.validator (compiled)', lambda: validator.validate(cv_raw))
+    ]:
+        time_start = time.perf_counter()
+        for _ in range(repeat):
+            validate_fn()
+        elapsed = (time.perf_counter() - time_start) / repeat
+        print('{:<20} {:<32} {:>10.3f} ms'.format(
+            cv_name, label, elapsed * 1000
+        ))
@@ -0,0 +1,31 @@
+import resumpy.utils
+import resumpy.validator
+import argparse
+import json
+import os
+
+# Compiles the schema into a cached validator, so that workers do not have to
+# generate it on their first load
+parser = argparse.ArgumentParser(
+    description='Compile a JSON schema into a cached validator'
+)
+parser.add_argument(
+    'schema', nargs='?', help='Path to the JSON schema file',
+    default=os.path.join(
+        os.path.dirname(os.path.dirname(__file__)), 'cv.schema.json'
+    )
+)
+args = parser.parse_args()
+
+with open(args.schema) as schema_file:
+    schema = json.load(schema_file)
+validator = resumpy.validator.Validator(schema)
+if validator.validate_fn is None:
+    print('Schema can not be compiled, jsonschema will be used instead.')
+else:
+    print(os.path.join(
+        resumpy.utils.get_cache_dir('validators'),
+        'resumpy_validator_{}.py'.format(
+            resumpy.validator.get_schema_hash(schema)[:16]
+        )
+    ))
@@ -9,7 +9,7 @@ def get_example_path():
 
 
 def get_schema_path():
-    return os.path.join(base_path, 'cv.example.json')
+    return os.path.join(base_path, 'cv.schema.json')
 
 
 def get_cls_path(theme_name):
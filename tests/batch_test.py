@@ -0,0 +1,126 @@
+import resumpy
+import resumpy.batch
+import resumpy.postprocess
+import resumpy.themes
+import os
+import pytest
+import sys
+import tests
+
+# Stub LaTeX compiler writing one page per CV of a batch, each one with a
+# different width, and the page markers of each CV into the log. Batches with
+# `fail` in their name fail to compile, and so do CVs named `broken`
+STUB_COMPILER = '''import pikepdf, sys
+tex_path = sys.argv[-1]
+tex = open(tex_path).read()
+if 'RESUMPY-BATCH-PAGES' in tex and 'fail' in tex or 'broken' in tex:
+    sys.exit(1)
+cvs = max(tex.count('RESUMPY-BATCH-PAGES'), 1)
+pdf = pikepdf.new()
+for i in range(cvs):
+    pdf.add_blank_page(page_size=(100 + i, 100))
+pdf.save(tex_path[:-4] + '.pdf')
+open(tex_path[:-4] + '.log', 'wt').write(
+    ''.join('RESUMPY-BATCH-PAGES 2\\n' for _ in range(cvs))
+)'''
+
+
+def get_cvs(*names):
+    cvs = []
+    for name in names:
+        cv_raw = tests.get_reduced_cv_raw()
+        cv_raw['basic']['name'] = name
+        cvs.append(resumpy.CV(tests.get_logger()))
+        cvs[-1].model = resumpy.model.Model(cv_raw)
+    return cvs
+
+
+def test_format_batch():
+    theme = resumpy.themes.ThemeSitges(tests.get_logger())
+    cvs = get_cvs('Arya', 'Jon \U0001F600', 'Sansa')
+    doc, errors, _ = resumpy.batch.format_batch(cvs, theme)
+    tex = doc.dumps()
+    assert list(errors) == [1]
+    assert 'Jon' not in tex
+    assert tex.count('\\typeout{RESUMPY-BATCH-PAGES \\arabic{page}}') == 2
+    assert tex.count('\\let\\@name\\relax') == 2
+    assert tex.index('Arya Snow') < tex.index('\\let\\@name\\relax') < \
+        tex.index('Sansa Snow')
+    assert tex.count('\\usepackage[absolute,overlay]{textpos}') == 1
+
+
+def test_format_batch_unexpected_error():
+    theme = resumpy.themes.ThemeSitges(tests.get_logger())
+    cvs = get_cvs('Arya', 'Jon', 'Sansa')
+    cvs[1].model.languages.value[0].level.value = 'Fluent'
+    doc, errors, _ = resumpy.batch.format_batch(cvs, theme, lint=None)
+    assert list(errors) == [1]
+    assert isinstance(errors[1], KeyError)
+    assert 'Arya Snow' in doc.dumps() and 'Sansa Snow' in doc.dumps()
+
+
+def test_get_page_counts(tmp_path):
+    file_path = str(tmp_path / 'batch')
+    assert resumpy.batch.get_page_counts(file_path) == []
+    with open(file_path + '.log', 'wt') as log_file:
+        log_file.write('RESUMPY-BATCH-PAGES 3\n[2] [3]\nRESUMPY-BATCH-PAGES 2')
+    assert resumpy.batch.get_page_counts(file_path) == [2, 1]
+
+
+@pytest.mark.skipif(
+    resumpy.batch.pikepdf is None, reason='pikepdf is not installed'
+)
+def test_split_pdf(tmp_path):
+    pdf = resumpy.batch.pikepdf.new()
+    for i in range(5):
+        pdf.add_blank_page(page_size=(100 + i, 100))
+    pdf.save(str(tmp_path / 'batch.pdf'))
+    output_paths = [str(tmp_path / 'a.pdf'), str(tmp_path / 'b.pdf')]
+    resumpy.batch.split_pdf(
+        str(tmp_path / 'batch.pdf'), [2, 3], output_paths, optimize=True
+    )
+    widths = []
+    for output_path in output_paths:
+        with resumpy.batch.pikepdf.open(output_path) as output:
+            widths.append([int(p.mediabox[2]) for p in output.pages])
+    assert widths == [[100, 101], [102, 103, 104]]
+
+
+@pytest.mark.skipif(
+    resumpy.batch.pikepdf is None, reason='pikepdf is not installed'
+)
+@pytest.mark.parametrize('names', [('Arya', 'Sansa', 'Bran'), ('fail', 'Jon')])
+def test_generate_batch(tmp_path, names):
+    file_paths = [str(tmp_path / name) for name in names]
+    pdf_paths = resumpy.batch.generate_batch(
+        get_cvs(*names), 'sitges', file_paths, tests.get_logger(),
+        compiler=sys.executable, compiler_args=['-c', STUB_COMPILER]
+    )
+    assert pdf_paths == [file_path + '.pdf' for file_path in file_paths]
+    for i, pdf_path in enumerate(pdf_paths):
+        with resumpy.batch.pikepdf.open(pdf_path) as pdf:
+            assert len(pdf.pages) == 1
+            # Batches which fail are generated one by one
+            assert int(pdf.pages[0].mediabox[2]) == \
+                (100 + i if names[0] != 'fail' else 100)
+    assert sorted(os.listdir(str(tmp_path))) == sorted(
+        name + '.pdf' for name in names
+    )
+
+
+@pytest.mark.skipif(
+    resumpy.batch.pikepdf is None, reason='pikepdf is not installed'
+)
+@pytest.mark.parametrize('names', [
+    ('Arya', 'Jon \U0001F600', 'Sansa'), ('fail', 'broken', 'Bran')
+])
+def test_generate_batch_errors(tmp_path, names):
+    file_paths = [str(tmp_path / str(i)) for i in range(len(names))]
+    pdf_paths = resumpy.batch.generate_batch(
+        get_cvs(*names), 'sitges', file_paths, tests.get_logger(),
+        compiler=sys.executable, compiler_args=['-c', STUB_COMPILER]
+    )
+    assert pdf_paths == [file_paths[0] + '.pdf', None, file_paths[2] + '.pdf']
+    assert sorted(
+        f for f in os.listdir(str(tmp_path)) if f.endswith('.pdf')
+    ) == ['0.pdf', '2.pdf']
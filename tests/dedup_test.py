@@ -0,0 +1,47 @@
+import resumpy.dedup
+import resumpy.model
+import pytest
+import tests
+
+
+def get_model(**basic):
+    cv_raw = tests.get_reduced_cv_raw()
+    cv_raw['basic'].update(basic)
+    return resumpy.model.Model(cv_raw)
+
+
+def test_get_bands():
+    assert resumpy.dedup.DuplicateDetector.get_bands(0.8, 128) == 8
+    assert 128 % resumpy.dedup.DuplicateDetector.get_bands(0.5, 128) == 0
+
+
+def test_get_shingles():
+    shingles = resumpy.dedup.get_shingles(get_model(hobbies='A b, C d'))
+    assert {'a b c', 'b c d', 'john', 'tv star'} <= shingles
+
+
+def test_signature_similarity():
+    detector = resumpy.dedup.DuplicateDetector(num_perm=256)
+    hobbies = ' '.join('word{}'.format(i) for i in range(100))
+    signature = detector.signature(get_model(hobbies=hobbies))
+    assert (detector.signature(get_model(hobbies=hobbies)) == signature).all()
+    near_signature = detector.signature(
+        get_model(hobbies=hobbies.replace('word50', 'other'))
+    )
+    assert 0.8 < (near_signature == signature).mean() < 1
+
+
+def test_find_duplicates():
+    hobbies = ' '.join('word{}'.format(i) for i in range(100))
+    models = [
+        ('a', get_model(hobbies=hobbies)),
+        ('b', get_model(hobbies='Something completely different')),
+        ('c', get_model(hobbies=hobbies)),
+        ('d', get_model(hobbies=hobbies.replace('word50', 'other'))),
+        ('e', get_model(hobbies=' '.join(reversed(hobbies.split()))))
+    ]
+    duplicates = dict(resumpy.dedup.find_duplicates(models))
+    assert duplicates['c'] == [('a', 1.0)]
+    assert [doc_id for doc_id, _ in duplicates['d']] == ['a', 'c']
+    assert duplicates['d'][0][1] == pytest.approx(0.9, abs=0.1)
+    assert 'b' not in duplicates and 'e' not in duplicates
@@ -0,0 +1,61 @@
+import resumpy
+import resumpy.themes
+import resumpy.utils
+import datetime
+import os
+import pytest
+import shutil
+import sys
+import tests
+
+# Stub LaTeX compiler writing the environment it receives into the PDF
+STUB_COMPILER = '''import os, sys
+open(sys.argv[-1][:-4] + '.pdf', 'wt').write('{} {}'.format(
+    os.environ.get('SOURCE_DATE_EPOCH'), os.environ.get('FORCE_SOURCE_DATE')
+))'''
+
+
+def get_cv():
+    cv = resumpy.CV(tests.get_logger())
+    cv.load(tests.get_example_path(), tests.get_schema_path())
+    return cv
+
+
+def test_get_age_reference_date():
+    birthday = datetime.date(1996, 1, 20)
+    assert resumpy.utils.get_age(birthday, datetime.date(2020, 1, 19)) == 23
+    assert resumpy.utils.get_age(birthday, datetime.date(2020, 1, 20)) == 24
+
+
+def test_theme_reference_date():
+    model = get_cv().model
+    theme = resumpy.themes.ThemeSitges(tests.get_logger())
+    theme.reference_date = datetime.date(2020, 10, 28)
+    assert '\\detailitem{\\faCalendar}{Age}{24}' in theme.format(model).dumps()
+
+
+def test_generate_deterministic_environ(tmp_path):
+    file_path = str(tmp_path / 'cv')
+    get_cv().generate(
+        'sitges', file_path, keep_tex=False, deterministic=True,
+        compiler=sys.executable, compiler_args=['-c', STUB_COMPILER]
+    )
+    with open(file_path + '.pdf') as pdf_file:
+        assert pdf_file.read() == '1603843200 1'
+    assert 'SOURCE_DATE_EPOCH' not in os.environ
+
+
+@pytest.mark.skipif(
+    shutil.which('pdflatex') is None, reason='pdflatex is not installed'
+)
+def test_generate_deterministic_bytes(tmp_path):
+    pdf_bytes = []
+    for run in range(2):
+        os.makedirs(str(tmp_path / str(run)))
+        file_path = str(tmp_path / str(run) / 'cv')
+        get_cv().generate(
+            'sitges', file_path, keep_tex=False, deterministic=True
+        )
+        with open(file_path + '.pdf', 'rb') as pdf_file:
+            pdf_bytes.append(pdf_file.read())
+    assert pdf_bytes[0] == pdf_bytes[1]
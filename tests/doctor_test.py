@@ -0,0 +1,88 @@
+import resumpy
+import resumpy.doctor
+import os
+import pytest
+import sys
+import tests
+
+# Fake `kpsewhich` which finds every file except `paracol.sty`, logging each
+# call next to itself
+KPSEWHICH = '''#!/bin/sh
+echo call >> "$0.calls"
+for f in "$@"; do
+    [ "$f" = paracol.sty ] || echo "/texmf/$f"
+done
+[ "$#" -eq 1 ] && [ "$1" = --version ] && echo "kpathsea version 6.3.5"
+'''
+
+
+@pytest.fixture
+def tex_bin(tmp_path, monkeypatch):
+    bin_path = tmp_path / 'bin'
+    bin_path.mkdir()
+    for name, script in [
+        ('kpsewhich', KPSEWHICH),
+        ('pdflatex', '#!/bin/sh\necho "pdfTeX 3.141592653-2.6-1.40.25"\n')
+    ]:
+        (bin_path / name).write_text(script)
+        (bin_path / name).chmod(0o755)
+    monkeypatch.setenv('PATH', str(bin_path))
+    monkeypatch.setenv('RESUMPY_CACHE_DIR', str(tmp_path / 'cache'))
+    monkeypatch.setattr(resumpy.doctor, '_reports', {})
+    monkeypatch.setattr(resumpy.doctor, '_last_report', None)
+    return bin_path
+
+
+def test_get_requirements():
+    requirements = resumpy.doctor.get_requirements('sitges')
+    assert requirements[0] == 'report.cls'
+    assert {'paracol.sty', 'roboto.sty', 'setspace.sty'} <= set(requirements)
+    assert 'opensans.sty' not in requirements
+
+
+def test_get_report(tex_bin, monkeypatch):
+    report = resumpy.doctor.get_report()
+    assert report['engines']['pdflatex']['version'].startswith('pdfTeX')
+    assert report['engines']['xelatex'] is None
+    assert report['themes']['sitges']['roboto.sty'] == '/texmf/roboto.sty'
+    assert report['themes']['sitges']['paracol.sty'] is None
+    assert 'paracol.sty     MISSING' in resumpy.doctor.format_report(report)
+
+    # The last report is reused without checking the installation, and
+    # reports are cached until the TeX installation changes
+    with open(str(tex_bin / 'kpsewhich'), 'a') as kpsewhich_file:
+        kpsewhich_file.write('\n')
+    assert resumpy.doctor.get_report() is report
+    monkeypatch.setattr(resumpy.doctor, 'REPORT_TTL', 0)
+    report = resumpy.doctor.get_report()
+    assert (tex_bin / 'kpsewhich.calls').read_text().count('call') == 4
+    resumpy.doctor._reports.clear()
+    assert resumpy.doctor.get_report() == report
+    assert (tex_bin / 'kpsewhich.calls').read_text().count('call') == 4
+
+
+def test_get_report_without_cache(tex_bin, tmp_path, monkeypatch):
+    (tmp_path / 'file').write_text('')
+    monkeypatch.setenv('RESUMPY_CACHE_DIR', str(tmp_path / 'file'))
+    report = resumpy.doctor.get_report()
+    assert report['themes']['sitges']['paracol.sty'] is None
+
+
+def test_preflight(tex_bin, tmp_path):
+    with pytest.raises(resumpy.doctor.PreflightError) as error:
+        resumpy.doctor.preflight('sitges')
+    assert error.value.problems == [
+        'Missing LaTeX files required by the sitges theme: paracol.sty'
+    ]
+    report = resumpy.doctor.get_report()
+    assert resumpy.doctor.get_problems(report, 'sitges', 'xelatex')[0] == \
+        'xelatex is not installed'
+    assert resumpy.doctor.get_problems(report, 'sitges', sys.executable) == []
+
+    # Jobs are refused before copying any file or starting LaTeX
+    cv = resumpy.CV(tests.get_logger())
+    cv.load(tests.get_example_path(), tests.get_schema_path())
+    os.makedirs(str(tmp_path / 'out'))
+    with pytest.raises(resumpy.doctor.PreflightError):
+        cv.generate('sitges', str(tmp_path / 'out' / 'cv'), keep_tex=False)
+    assert os.listdir(str(tmp_path / 'out')) == []
@@ -0,0 +1,112 @@
+import resumpy
+import resumpy.fit
+import resumpy.themes
+import logging
+import math
+import pytest
+import sys
+import tests
+
+# Stub LaTeX compiler writing a log with one page per 6000 bytes of LaTeX code
+STUB_COMPILER = '''import os, sys
+tex_path = sys.argv[-1]
+pages = os.path.getsize(tex_path) // 6000 + 1
+open(tex_path[:-4] + '.pdf', 'wb').write(b'%PDF-1.4')
+open(tex_path[:-4] + '.log', 'wt').write(
+    'Output written on {}.pdf\\n ({} pages, 8 bytes).'.format(
+        tex_path[:-4], pages
+    )
+)'''
+
+
+def get_cv():
+    cv = resumpy.CV(tests.get_logger())
+    cv.load(tests.get_example_path(), tests.get_schema_path())
+    return cv
+
+
+def test_estimate_pages():
+    model = get_cv().model
+    theme = resumpy.themes.ThemeSitges(tests.get_logger())
+    estimate = theme.estimate_pages(model)
+    assert 1 < estimate < 3
+    theme.spacing = resumpy.fit.CONDENSED_SPACING
+    assert theme.estimate_pages(model) < estimate
+    assert '\\setlength{\\bigskipamount}{6pt' in theme.format(model).dumps()
+
+
+def test_get_variants():
+    model = get_cv().model
+    variants = resumpy.fit.get_variants(model, ['projects', 'hobbies'])
+    assert variants[0] == (model, 1, [])
+    assert variants[1][2] == ['condensed spacing']
+    assert variants[-1][2][-2:] == ['dropped projects', 'dropped hobbies']
+    assert variants[-1][0].get('projects') is None
+    assert variants[-1][0].get('basic', 'hobbies') is None
+    assert variants[-1][0].get('education')[0].get('description')[1].get(
+        'content'
+    ) == model.get('education')[0].get('description')[1].get('content')[:1]
+    assert 'kept 1 of 5 bullets of education[0].description[1]' in \
+        variants[-1][2]
+    assert len(model.get('education')[0].get('description')[1].get(
+        'content'
+    )) == 5
+    with pytest.raises(ValueError):
+        resumpy.fit.get_variants(model, ['experience'])
+
+
+class RecordingThemeSitges(resumpy.themes.ThemeSitges):
+    last_model = None
+
+    def format(self, model):
+        self.last_model = model
+        return super(RecordingThemeSitges, self).format(model)
+
+
+def test_fit():
+    model = get_cv().model
+    theme = RecordingThemeSitges(tests.get_logger())
+    compiled = []
+
+    # The estimator is too optimistic, so the first candidate does not fit
+    def compile_doc(doc):
+        compiled.append(doc)
+        return math.ceil(1.3 * theme.estimate_pages(theme.last_model))
+
+    _, _, pages, changes = resumpy.fit.fit(model, theme, 2, compile_doc)
+    assert len(compiled) == 2
+    assert pages == 2
+    assert changes[0] == 'condensed spacing'
+
+
+def test_fit_no_changes():
+    model = get_cv().model
+    theme = resumpy.themes.ThemeSitges(tests.get_logger())
+    fitted_model, _, pages, changes = resumpy.fit.fit(
+        model, theme, 3, lambda doc: 2
+    )
+    assert fitted_model is model
+    assert (pages, changes) == (2, [])
+
+
+def test_get_page_count(tmp_path):
+    file_path = str(tmp_path / 'cv')
+    assert resumpy.fit.get_page_count(file_path) is None
+    with open(file_path + '.log', 'wt') as log_file:
+        log_file.write('Output written on /a/very/long/path/to/cv.pdf\n (1 '
+                       'page, 1234 bytes).\nTranscript written on cv.log.')
+    assert resumpy.fit.get_page_count(file_path) == 1
+    resumpy.fit.clean_latex_files(file_path)
+    assert resumpy.fit.get_page_count(file_path) is None
+
+
+def test_generate_max_pages(tmp_path, caplog):
+    file_path = str(tmp_path / 'cv')
+    with caplog.at_level(logging.INFO, logger='resumpy'):
+        get_cv().generate(
+            'sitges', file_path, keep_tex=False, max_pages=1,
+            drop_order=['projects', 'hobbies'], compiler=sys.executable,
+            compiler_args=['-c', STUB_COMPILER]
+        )
+    assert 'To fit in 1 pages: dropped projects' in caplog.text
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['cv.pdf']
@@ -0,0 +1,96 @@
+import resumpy
+import resumpy.images
+import resumpy.themes
+import os
+import pytest
+import sys
+import tests
+
+pytestmark = pytest.mark.skipif(
+    resumpy.images.PIL is None, reason='Pillow is not installed'
+)
+
+
+# Stub LaTeX compiler which fails unless the photos included by the document
+# are in its folder
+STUB_COMPILER = '''import os, re, sys
+tex_path = sys.argv[-1]
+for photo in re.findall(r'\\\\photo\\{([^}]*)\\}', open(tex_path).read()):
+    if not os.path.exists(os.path.join(os.path.dirname(tex_path), photo)):
+        sys.exit(1)
+open(tex_path[:-4] + '.pdf', 'wb').write(b'%PDF-1.4')'''
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    # Characters which are special in LaTeX must not reach the document
+    monkeypatch.setenv('RESUMPY_CACHE_DIR', str(tmp_path / 'cache %#_ dir'))
+
+
+def save_photo(path, size, mode='RGB'):
+    resumpy.images.PIL.Image.new(mode, size, 'red').save(path)
+    return path
+
+
+def test_prepare_photo(tmp_path):
+    photo_path = save_photo(str(tmp_path / 'photo.png'), (2000, 1000), 'RGBA')
+    prepared_path = resumpy.images.prepare_photo(photo_path, 1, dpi=300)
+    assert prepared_path.startswith(str(tmp_path / 'cache %#_ dir'))
+    with resumpy.images.PIL.Image.open(prepared_path) as photo:
+        assert (photo.format, photo.mode, photo.size) == \
+            ('JPEG', 'RGB', (300, 300))
+
+    # Prepared photos are reused, and small photos are never upsampled
+    mtime = os.path.getmtime(prepared_path)
+    assert resumpy.images.prepare_photo(photo_path, 1, dpi=300) == \
+        prepared_path
+    assert os.path.getmtime(prepared_path) == mtime
+    small_path = save_photo(str(tmp_path / 'small.jpg'), (200, 100))
+    with resumpy.images.PIL.Image.open(
+            resumpy.images.prepare_photo(small_path, 1, dpi=300)
+    ) as photo:
+        assert photo.size == (100, 100)
+
+
+def test_prepare_photo_without_cache(tmp_path, monkeypatch):
+    (tmp_path / 'cache').write_text('not a folder')
+    monkeypatch.setenv('RESUMPY_CACHE_DIR', str(tmp_path / 'cache'))
+    monkeypatch.setattr(resumpy.images, '_tmp_dir', None)
+    photo_path = save_photo(str(tmp_path / 'photo.jpg'), (200, 100))
+    prepared_path = resumpy.images.prepare_photo(photo_path, 1)
+    assert os.path.dirname(prepared_path) == resumpy.images._tmp_dir
+    assert os.listdir(resumpy.images._tmp_dir) == [
+        os.path.basename(prepared_path)
+    ]
+
+
+def get_cv(tmp_path):
+    cv_raw = tests.get_reduced_cv_raw()
+    cv_raw['basic']['photo'] = 'photo.jpg'
+    save_photo(str(tmp_path / 'photo.jpg'), (600, 800))
+    cv = resumpy.CV(tests.get_logger())
+    cv.model, cv.base_path = resumpy.model.Model(cv_raw), str(tmp_path)
+    return cv
+
+
+def test_format_photo(tmp_path):
+    cv = get_cv(tmp_path)
+    theme = resumpy.themes.ThemeSitges(tests.get_logger())
+    theme.photo_dpi = 100
+    estimate = theme.estimate_pages(cv.model)
+    _, doc = cv.format(theme)
+    assert '\\photo{{{}}}{{1.6in}}'.format(
+        os.path.basename(theme.photo_path)
+    ) in doc.dumps()
+    assert theme.estimate_pages(cv.model) > estimate
+    with resumpy.images.PIL.Image.open(theme.photo_path) as photo:
+        assert photo.size == (160, 160)
+
+
+def test_generate_photo(tmp_path):
+    os.makedirs(str(tmp_path / 'out'))
+    get_cv(tmp_path).generate(
+        'sitges', str(tmp_path / 'out' / 'cv'), keep_tex=False, photo_dpi=50,
+        compiler=sys.executable, compiler_args=['-c', STUB_COMPILER]
+    )
+    assert os.listdir(str(tmp_path / 'out')) == ['cv.pdf']
@@ -0,0 +1,69 @@
+import resumpy.index
+import resumpy.model
+import copy
+import datetime
+import pytest
+import tests
+
+
+def get_corpus():
+    cv_raw_1 = tests.get_reduced_cv_raw()
+    cv_raw_1['skills'] = [
+        {'name': 'Python', 'category': 'Languages'},
+        {'name': 'Docker', 'category': 'Tools'}
+    ]
+    cv_raw_1['languages'] = [{'name': 'German', 'level': 'C1'}]
+    cv_raw_1['experience'][0]['date_end'] = '2019-06-30'
+    cv_raw_2 = copy.deepcopy(cv_raw_1)
+    cv_raw_2['skills'] = [{'name': 'Python', 'category': 'Tools'}]
+    cv_raw_2['languages'] = [{'name': 'German', 'level': 'B1'}]
+    cv_raw_2['experience'][0]['date_end'] = '2010-06-30'
+    cv_raw_3 = tests.get_minimal_cv_raw()
+    return [
+        ('cv-1', resumpy.model.Model(cv_raw_1)),
+        ('cv-2', resumpy.model.Model(cv_raw_2)),
+        ('cv-3', resumpy.model.Model(cv_raw_3))
+    ]
+
+
+@pytest.mark.parametrize('query,expected', [
+    ({}, ['cv-1', 'cv-2', 'cv-3']),
+    ({'skill': 'python'}, ['cv-1', 'cv-2']),
+    ({'skill': 'Python', 'category': 'Languages'}, ['cv-1']),
+    ({'category': 'Tools'}, ['cv-1', 'cv-2']),
+    ({'institution': 'Game of Thrones'}, ['cv-1', 'cv-2']),
+    ({'institution': 'Game of Thrones',
+      'after': datetime.date(2018, 1, 1)}, ['cv-1']),
+    ({'before': datetime.date(1999, 1, 1)}, []),
+    ({'after': datetime.date(2000, 1, 1)}, ['cv-1', 'cv-2']),
+    ({'after': datetime.date(2018, 1, 1)}, ['cv-1']),
+    ({'after': datetime.date(2100, 1, 1)}, []),
+    ({'language': 'German', 'min_level': 'C1'}, ['cv-1']),
+    ({'skill': 'Python', 'language': 'German', 'min_level': 'B1',
+      'after': datetime.date(2015, 1, 1)}, ['cv-1']),
+    ({'skill': 'Rust'}, [])
+])
+def test_index_query(query, expected):
+    index = resumpy.index.CorpusIndex.build(get_corpus())
+    assert sorted(index.query(**query)) == expected
+
+
+def test_index_empty():
+    index = resumpy.index.CorpusIndex.build([])
+    assert len(index) == 0
+    assert index.query() == []
+    assert index.query(skill='Python', after=datetime.date(2018, 1, 1)) == []
+
+
+@pytest.mark.parametrize('mmap', [True, False])
+def test_index_save_load(tmp_path, mmap):
+    index = resumpy.index.CorpusIndex.build(get_corpus())
+    index.save(str(tmp_path))
+    index_loaded = resumpy.index.CorpusIndex.load(str(tmp_path), mmap=mmap)
+    assert len(index_loaded) == len(index)
+    assert index_loaded.query(skill='Python', category='Languages') == \
+        index.query(skill='Python', category='Languages')
+    assert index_loaded.query(language='German', min_level='B1') == \
+        index.query(language='German', min_level='B1')
+    assert index_loaded.query(after=datetime.date(2000, 1, 1)) == \
+        index.query(after=datetime.date(2000, 1, 1))
@@ -0,0 +1,68 @@
+import resumpy.lint
+import resumpy.model
+import resumpy.themes
+import pytest
+import tests
+
+
+def get_model(**kwargs):
+    cv_raw = tests.get_reduced_cv_raw()
+    cv_raw['projects'][0]['link'] = {
+        'anchor': 'Wall', 'href': kwargs.get('href', 'https://wall.com')
+    }
+    cv_raw['experience'][0]['description'] = [{
+        'type': 'itemize',
+        'content': ['Kill', kwargs.get('text', 'White Walkers')]
+    }]
+    cv_raw['languages'][0]['level'] = kwargs.get('level', 'Native')
+    return resumpy.model.Model(cv_raw)
+
+
+def test_lint_example():
+    cv = resumpy.CV(tests.get_logger())
+    cv.load(tests.get_example_path(), tests.get_schema_path())
+    theme = resumpy.themes.ThemeSitges(tests.get_logger())
+    assert resumpy.lint.lint_model(cv.model) == []
+    assert resumpy.lint.lint_latex(
+        theme.format(cv.model).dumps(), cv.model
+    ) == []
+
+
+@pytest.mark.parametrize('kwargs,path,severity,fixed_value', [
+    ({'text': 'Winter \U0001F976'}, 'experience[0].description[0].content[1]',
+     'error', 'Winter '),
+    ({'href': 'https://wall.com/{north'}, 'projects[0].link.href', 'error',
+     'https://wall.com/%7Bnorth'),
+    ({'href': 'https://wall.com/~snow'}, 'projects[0].link.href', 'warning',
+     'https://wall.com/%7Esnow'),
+    ({'level': 'Fluent'}, 'languages[0].level', 'error', None)
+])
+def test_lint_model(kwargs, path, severity, fixed_value):
+    model = get_model(**kwargs)
+    issues = resumpy.lint.lint_model(model)
+    assert len(issues) == 1
+    assert issues[0].path == path
+    assert issues[0].severity == severity
+    assert issues[0].fixed_value == fixed_value
+    if fixed_value is not None:
+        model_fixed = resumpy.lint.fix_model(model, issues)
+        assert resumpy.lint.lint_model(model_fixed) == []
+
+
+def test_lint_latex():
+    model = get_model()
+    tex = '\\begin{document}\n\\textbf{White Walkers}}\n\\end{document}\n' \
+          '\\textbackslash{}faEnvelope{'
+    issues = resumpy.lint.lint_latex(tex, model)
+    assert [i.severity for i in issues] == ['error', 'warning', 'error']
+    assert issues[0].path == 'experience[0].description[0].content[1]'
+    assert issues[1].path is None
+
+
+def test_generate_rejects_before_compiling(tmp_path):
+    cv = resumpy.CV(tests.get_logger())
+    cv.model = get_model(href='https://wall.com/\\north')
+    with pytest.raises(resumpy.lint.LintError) as error:
+        cv.generate('sitges', str(tmp_path / 'cv'), keep_tex=False)
+    assert error.value.issues[0].path == 'projects[0].link.href'
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,45 @@
+import resumpy.loadtest
+import resumpy.validator
+import pytest
+import tests
+
+
+@pytest.mark.parametrize('scale', [1, 3])
+def test_synthetic_cv_is_valid(scale):
+    cv_raw = resumpy.loadtest.make_synthetic_cv_raw(
+        tests.get_reduced_cv_raw(), scale
+    )
+    assert len(cv_raw['experience']) == scale
+    resumpy.validator.get_validator(tests.get_schema_path()).validate(cv_raw)
+
+
+def test_percentiles():
+    values = list(range(1, 101))
+    assert resumpy.loadtest.get_percentile(values, 50) == 50
+    assert resumpy.loadtest.get_percentile(values, 99) == 99
+    assert resumpy.loadtest.get_percentile([3], 95) == 3
+    assert resumpy.loadtest.get_percentile([], 50) is None
+
+
+def test_load_test_with_stub_compiler(tmp_path):
+    results = resumpy.loadtest.run_load_test(
+        tests.get_example_path(), tests.get_schema_path(), 'sitges',
+        workers=2, duration=1, stub_compiler=True, output_dir=str(tmp_path)
+    )
+    assert results['count'] > 0
+    assert results['errors'] == 0
+    assert results['p50'] <= results['p95'] <= results['p99']
+    assert 'Throughput' in resumpy.loadtest.format_results(results)
+
+
+def test_load_test_errors(tmp_path):
+    results = resumpy.loadtest.run_load_test(
+        tests.get_example_path(), tests.get_schema_path(), 'barcelona',
+        workers=1, duration=30, stub_compiler=True, output_dir=str(tmp_path)
+    )
+    assert results['count'] == 0
+    assert results['errors'] == resumpy.loadtest.MAX_CONSECUTIVE_ERRORS
+    assert results['elapsed'] < 30
+    assert list(results['error_kinds']) == ["KeyError: 'barcelona'"]
+    assert "10 x KeyError: 'barcelona'" in \
+        resumpy.loadtest.format_results(results)
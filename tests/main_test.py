@@ -37,3 +37,61 @@ def test_dumping(format):
     cv_2.load('cv_dumped.' + format, tests.get_schema_path())
     os.remove('cv_dumped.' + format)
     assert cv == cv_2
+
+
+@pytest.mark.parametrize(
+    'cv_raw', [tests.get_minimal_cv_raw(), tests.get_reduced_cv_raw()]
+)
+def test_model_lazy_loading(cv_raw):
+    model = resumpy.model.Model(cv_raw)
+    model_lazy = resumpy.model.Model(cv_raw, lazy=True)
+    assert model_lazy.dump() == model.dump()
+    assert model_lazy.get('basic', 'name') == model.get('basic', 'name')
+    assert model_lazy.get('last_update') == model.get('last_update')
+    assert model_lazy.get('experience') == model.get('experience')
+    assert model_lazy.dump() == model.dump()
+
+
+def test_model_lazy_dump():
+    cv_raw = tests.get_reduced_cv_raw()
+    cv_raw['basic'].update({'nickname': 'Lord Snow', 'residence': None})
+    model = resumpy.model.Model(cv_raw, lazy=True)
+    dump = model.dump()
+    assert dump == resumpy.model.Model(cv_raw).dump()
+    assert 'nickname' not in dump['basic']
+    assert 'residence' not in dump['basic']
+    assert model.basic.raw is not None and model.experience.raw is not None
+    dump['basic']['name'] = 'Aegon'
+    dump['experience'][0]['position'] = 'King'
+    assert cv_raw['basic']['name'] == 'John'
+    assert cv_raw['experience'][0]['position'] != 'King'
+    assert model.dump() == resumpy.model.Model(cv_raw).dump()
+    model.basic.value.name.value = 'Aegon'
+    assert model.dump()['basic']['name'] == 'Aegon'
+
+
+def test_model_fingerprint():
+    cv_raw = tests.get_reduced_cv_raw()
+    cv_raw['skills'].append({'name': 'Ride dragons', 'category': 'Magic'})
+    model = resumpy.model.Model(cv_raw)
+    assert model.fingerprint() == resumpy.model.Model(
+        cv_raw, lazy=True
+    ).fingerprint()
+    cv_raw['skills'].reverse()
+    cv_raw['basic']['hobbies'] = ''
+    assert resumpy.model.Model(cv_raw) == model
+    assert hash(resumpy.model.Model(cv_raw)) == hash(model)
+    cv_raw['experience'].append(dict(cv_raw['experience'][0], position='Kg'))
+    assert resumpy.model.Model(cv_raw) != model
+    assert len({model, resumpy.model.Model(cv_raw), model}) == 2
+
+
+def test_model_eq_after_mutation():
+    cv_raw = tests.get_reduced_cv_raw()
+    model = resumpy.model.Model(cv_raw)
+    assert model == resumpy.model.Model(cv_raw)
+    hash(model)
+    model.basic.value.name.value = 'Aegon'
+    assert model != resumpy.model.Model(cv_raw)
+    model.basic.value.name.value = cv_raw['basic']['name']
+    assert model == resumpy.model.Model(cv_raw)
@@ -0,0 +1,55 @@
+import resumpy.markdown
+import resumpy.model
+import resumpy.themes
+import pytest
+import tests
+
+
+@pytest.mark.parametrize('text,tex', [
+    ('**Led** the _team_ of 50%', '\\textbf{Led} the \\textit{team} of 50\\%'),
+    ('*very **bold** text*', '\\textit{very \\textbf{bold} text}'),
+    ('`my_var{}` and my_var', '\\texttt{my\\_var\\{\\}} and my\\_var'),
+    ('[ResumPY](https://x.com/#{a})',
+     '\\href{https://x.com/\\#\\%7Ba\\%7D}{ResumPY}'),
+    ('First\nline\n\nSecond', 'First line\n\nSecond'),
+    ('```\nif a:\n  b\n```', '{\\ttfamily\\raggedright\nif a:\\newline\n'
+                             '~~b\\par}'),
+    ('```\n\nfoo\n\nbar\n \n```',
+     '{\\ttfamily\\raggedright\nfoo\\newline\n\\mbox{}\\newline\nbar\\par}'),
+])
+def test_inline(text, tex):
+    assert resumpy.markdown.to_latex(text) == tex
+
+
+def test_lists():
+    assert resumpy.markdown.to_latex(
+        'Tasks:\n- One\n  - Nested\n    continued\n- Two\n1. Three'
+    ).split('\n') == [
+        'Tasks:', '\\begin{itemize}', '\\item One', '\\begin{itemize}',
+        '\\item Nested continued', '\\end{itemize}', '\\item Two',
+        '\\end{itemize}', '\\begin{enumerate}', '\\item Three',
+        '\\end{enumerate}'
+    ]
+
+
+def test_cache():
+    resumpy.markdown.to_latex.cache_clear()
+    text = '- Repeated **description**'
+    assert resumpy.markdown.to_latex(text) is \
+        resumpy.markdown.to_latex(''.join(list(text)))
+    assert resumpy.markdown.to_latex.cache_info().hits == 1
+
+
+def test_format_markdown():
+    cv_raw = tests.get_reduced_cv_raw()
+    cv_raw['experience'][0]['description'] = [
+        {'type': 'markdown', 'content': 'Built **ResumPY**\n- Fast'}
+    ]
+    model = resumpy.model.Model(cv_raw)
+    theme = resumpy.themes.ThemeSitges(tests.get_logger())
+    assert 'Built \\textbf{ResumPY}\n\\begin{itemize}\n\\item Fast' in \
+        theme.format(model).dumps()
+    cv_raw['experience'][0]['description'][0]['content'] = 'Built ResumPY'
+    assert theme.estimate_pages(model) > theme.estimate_pages(
+        resumpy.model.Model(cv_raw)
+    )
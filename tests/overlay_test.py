@@ -0,0 +1,61 @@
+import resumpy.overlay
+import resumpy.model
+import json
+import jsonschema
+import pytest
+import tests
+
+
+def get_schema():
+    with open(tests.get_schema_path()) as schema_file:
+        return json.load(schema_file)
+
+
+@pytest.mark.parametrize('lazy', [False, True])
+def test_overlay_shares_untouched(lazy):
+    model = resumpy.model.Model(tests.get_reduced_cv_raw(), lazy=lazy)
+    model_patched = resumpy.overlay.apply_patch(model, {
+        'basic': {'profession': 'King in the North'},
+        'skills': [{'name': 'Ride dragons'}]
+    }, get_schema())
+    assert model_patched.get('basic', 'profession') == 'King in the North'
+    assert model_patched.get('basic', 'name') == 'John'
+    assert model_patched.get('skills')[0].get('name') == 'Ride dragons'
+    assert model.get('basic', 'profession') == 'TV Star'
+    assert model_patched.experience is model.experience
+    assert model_patched.contact is model.contact
+    assert model_patched.get('basic').name is model.get('basic').name
+
+
+def test_overlay_same_as_merged():
+    cv_raw = tests.get_reduced_cv_raw()
+    patch = {
+        'lang': 'es',
+        'contact': {'website': {'anchor': 'Snow', 'href': 'snow.com'}},
+        'awards': None,
+        'experience': [{
+            'institution': 'House of the Dragon',
+            'position': 'Ancestor',
+            'date_start': '2022-08-21'
+        }]
+    }
+    model_patched = resumpy.overlay.apply_patch(
+        resumpy.model.Model(cv_raw), patch, get_schema()
+    )
+    assert model_patched.dump() == resumpy.model.Model(
+        resumpy.overlay.merge_patch(cv_raw, patch)
+    ).dump()
+
+
+@pytest.mark.parametrize('patch,path', [
+    ({'lang': 'fr'}, ['lang']),
+    ({'basic': {'name': None}}, ['basic']),
+    ({'contact': {'phone': 666}}, ['contact', 'phone']),
+    ({'skills': [{'score': 10}]}, ['skills', 0]),
+    ({'last_update': None}, [])
+])
+def test_overlay_invalid(patch, path):
+    model = resumpy.model.Model(tests.get_reduced_cv_raw())
+    with pytest.raises(jsonschema.ValidationError) as error:
+        resumpy.overlay.apply_patch(model, patch, get_schema())
+    assert list(error.value.path) == path
@@ -0,0 +1,86 @@
+import resumpy.postprocess
+import os
+import pytest
+import shutil
+import subprocess
+import sys
+import tests
+
+
+def write_pdf(pdf_path):
+    pikepdf = pytest.importorskip('pikepdf')
+    pdf = pikepdf.new()
+    for i in range(5):
+        pdf.add_blank_page()
+        pdf.pages[-1].Contents = pdf.make_stream(
+            b'BT /F1 12 Tf 72 720 Td (Page) Tj ET\n' * 200
+        )
+    pdf.save(pdf_path, compress_streams=False)
+
+
+def test_optimize_pdf(tmp_path):
+    pdf_path = str(tmp_path / 'cv.pdf')
+    write_pdf(pdf_path)
+    size_before, size_after = resumpy.postprocess.optimize_pdf(
+        pdf_path, tests.get_logger()
+    )
+    assert size_after < size_before
+    assert (tmp_path / 'cv.pdf').stat().st_size == size_after
+    assert not (tmp_path / 'cv.pdf.optimized').exists()
+
+
+def test_optimize_pdf_without_backend(tmp_path, monkeypatch):
+    monkeypatch.setattr(resumpy.postprocess, 'pikepdf', None)
+    monkeypatch.setattr(shutil, 'which', lambda command: None)
+    pdf_path = tmp_path / 'cv.pdf'
+    pdf_path.write_bytes(b'%PDF-1.5\n')
+    assert resumpy.postprocess.get_backend() is None
+    assert resumpy.postprocess.optimize_pdf(
+        str(pdf_path), tests.get_logger()
+    ) == (9, 9)
+
+
+def write_qpdf(tmp_path, monkeypatch, exit_code):
+    """Installs a fake qpdf which writes the first bytes of the input file to
+    the output file and exits with `exit_code`."""
+    bin_path = tmp_path / 'bin'
+    bin_path.mkdir()
+    qpdf_path = bin_path / 'qpdf'
+    qpdf_path.write_text(
+        '#!{}\nimport sys\n'
+        'open(sys.argv[-1], "wb").write(open(sys.argv[-2], "rb").read(9))\n'
+        'print("WARNING: recovered")\n'
+        'sys.exit({})\n'.format(sys.executable, exit_code)
+    )
+    qpdf_path.chmod(0o755)
+    monkeypatch.setattr(resumpy.postprocess, 'pikepdf', None)
+    monkeypatch.setenv('PATH', str(bin_path), prepend=os.pathsep)
+
+
+def test_optimize_pdf_qpdf_warnings(tmp_path, monkeypatch):
+    write_qpdf(tmp_path, monkeypatch, 3)
+    pdf_path = tmp_path / 'cv.pdf'
+    pdf_path.write_bytes(b'%PDF-1.5\n%%EOF\n')
+    assert resumpy.postprocess.get_backend() == 'qpdf'
+    assert resumpy.postprocess.optimize_pdf(
+        str(pdf_path), tests.get_logger()
+    ) == (15, 9)
+    assert pdf_path.read_bytes() == b'%PDF-1.5\n'
+
+
+def test_optimize_pdf_qpdf_error(tmp_path, monkeypatch):
+    write_qpdf(tmp_path, monkeypatch, 2)
+    pdf_path = tmp_path / 'cv.pdf'
+    pdf_path.write_bytes(b'%PDF-1.5\n%%EOF\n')
+    with pytest.raises(subprocess.CalledProcessError) as error:
+        resumpy.postprocess.optimize_pdf(str(pdf_path), tests.get_logger())
+    assert error.value.returncode == 2
+    assert b'recovered' in error.value.output
+
+
+def test_optimize_pdf_empty(tmp_path):
+    pdf_path = tmp_path / 'cv.pdf'
+    pdf_path.write_bytes(b'')
+    assert resumpy.postprocess.optimize_pdf(
+        str(pdf_path), tests.get_logger()
+    ) == (0, 0)
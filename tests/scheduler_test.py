@@ -0,0 +1,82 @@
+import resumpy.scheduler
+import concurrent.futures
+import os
+import pytest
+import threading
+
+
+def get_scheduler(**kwargs):
+    return resumpy.scheduler.Scheduler(
+        concurrent.futures.ThreadPoolExecutor(kwargs.get('max_workers', 1)),
+        **kwargs
+    )
+
+
+def test_priority_and_fairness():
+    started, order = threading.Event(), []
+    release = threading.Event()
+
+    def block():
+        started.set()
+        release.wait()
+
+    with get_scheduler(max_workers=1) as scheduler:
+        scheduler.submit(block)
+        started.wait()
+        futures = [
+            scheduler.submit(order.append, 'a1', priority='batch', tenant='a'),
+            scheduler.submit(order.append, 'a2', priority='batch', tenant='a'),
+            scheduler.submit(order.append, 'a3', priority='batch', tenant='a'),
+            scheduler.submit(order.append, 'b1', priority='batch', tenant='b'),
+            scheduler.submit(order.append, 'i1', tenant='a')
+        ]
+        assert scheduler.metrics()['batch']['queued'] == 4
+        release.set()
+        concurrent.futures.wait(futures)
+    assert order == ['i1', 'a1', 'b1', 'a2', 'a3']
+
+
+def test_reserved_workers():
+    release = threading.Event()
+    with get_scheduler(max_workers=2, reserved_workers=1) as scheduler:
+        batch_futures = [
+            scheduler.submit(release.wait, priority='batch') for _ in range(2)
+        ]
+        assert scheduler.metrics()['running'] == 1
+        assert scheduler.submit(lambda: 1).result(timeout=5) == 1
+        release.set()
+        concurrent.futures.wait(batch_futures)
+        metrics = scheduler.metrics()
+    assert metrics['batch']['completed'] == 2
+    assert metrics['interactive']['completed'] == 1
+
+
+def test_load_shedding():
+    release = threading.Event()
+    with get_scheduler(max_workers=1, max_queued={'batch': 1}) as scheduler:
+        scheduler.submit(release.wait, priority='batch')
+        scheduler.submit(release.wait, priority='batch')
+        with pytest.raises(resumpy.scheduler.QueueFullError):
+            scheduler.submit(release.wait, priority='batch')
+        with pytest.raises(ValueError):
+            scheduler.submit(release.wait, priority='urgent')
+        assert scheduler.metrics()['batch']['rejected'] == 1
+        release.set()
+
+
+def test_exceptions():
+    with get_scheduler() as scheduler:
+        future = scheduler.submit(int, 'a')
+        with pytest.raises(ValueError):
+            future.result(timeout=5)
+        assert scheduler.metrics()['interactive']['failed'] == 1
+
+
+def test_broken_process_pool():
+    with resumpy.scheduler.Scheduler(max_workers=1) as scheduler:
+        with pytest.raises(concurrent.futures.process.BrokenProcessPool):
+            scheduler.submit(os._exit, 1).result(timeout=30)
+        assert scheduler.submit(abs, -1).result(timeout=30) == 1
+        metrics = scheduler.metrics()
+    assert metrics['executor_restarts'] == 1
+    assert metrics['interactive']['failed'] == 1
@@ -0,0 +1,122 @@
+import resumpy.loadtest
+import resumpy.server
+import os
+import pytest
+import socket
+import sys
+import threading
+import tests
+
+
+@pytest.fixture
+def socket_path(tmp_path):
+    socket_path = str(tmp_path / 'resumpy.sock')
+    server = resumpy.server.RenderServer(
+        socket_path, tests.get_schema_path(), tests.get_logger(),
+        compiler=sys.executable,
+        compiler_args=['-c', resumpy.loadtest.STUB_COMPILER]
+    )
+    server.warm_up(warm_tex=False)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    yield socket_path
+    server.shutdown()
+    thread.join()
+    server.server_close()
+
+
+def test_ping(socket_path):
+    response = resumpy.server.send_request(socket_path, {'command': 'ping'})
+    assert response == {'status': 'ok'}
+
+
+def test_render(socket_path, tmp_path):
+    file_path = str(tmp_path / 'cv')
+    response = resumpy.server.send_request(socket_path, {
+        'command': 'render', 'cv_file': tests.get_example_path(),
+        'theme': 'sitges', 'file_path': file_path,
+        'reference_date': '2020-10-28'
+    })
+    assert response == {'status': 'ok', 'file_path': file_path + '.pdf'}
+    assert os.path.exists(file_path + '.pdf')
+    assert not os.path.exists(file_path + '.tex')
+
+
+def test_render_errors(socket_path, tmp_path):
+    response = resumpy.server.send_request(socket_path, {
+        'command': 'render', 'cv_file': str(tmp_path / 'missing.json'),
+        'theme': 'sitges', 'file_path': str(tmp_path / 'cv')
+    })
+    assert response['status'] == 'error'
+    response = resumpy.server.send_request(socket_path, {'command': 'stop'})
+    assert response['status'] == 'error'
+    response = resumpy.server.send_request(socket_path, ['render'])
+    assert response['status'] == 'error'
+
+    # Renders which the TeX installation can not compile are refused before
+    # being queued
+    response = resumpy.server.send_request(socket_path, {
+        'command': 'render', 'cv_file': tests.get_example_path(),
+        'theme': 'barcelona', 'file_path': str(tmp_path / 'cv')
+    })
+    assert response['error'].startswith(
+        "PreflightError: Theme 'barcelona' does not exist"
+    )
+    response = resumpy.server.send_request(
+        socket_path, {'command': 'metrics'}
+    )
+    assert response['metrics']['interactive']['submitted'] == 1
+
+
+def test_stale_socket(tmp_path):
+    stale_socket_path = str(tmp_path / 'stale.sock')
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as stale_socket:
+        stale_socket.bind(stale_socket_path)
+    server = resumpy.server.RenderServer(
+        stale_socket_path, tests.get_schema_path(), tests.get_logger()
+    )
+    server.server_close()
+    assert not os.path.exists(stale_socket_path)
+
+    # Files which are not sockets are never removed
+    open(stale_socket_path, 'w').close()
+    with pytest.raises(SystemExit):
+        resumpy.server.RenderServer(
+            stale_socket_path, tests.get_schema_path(), tests.get_logger()
+        )
+    assert os.path.exists(stale_socket_path)
+
+
+def test_default_socket_path(tmp_path, monkeypatch):
+    monkeypatch.setenv('XDG_RUNTIME_DIR', str(tmp_path))
+    socket_path = resumpy.server.get_default_socket_path()
+    assert socket_path == str(tmp_path / 'resumpy' / 'resumpy.sock')
+    assert os.stat(str(tmp_path / 'resumpy')).st_mode & 0o777 == 0o700
+    os.chmod(str(tmp_path / 'resumpy'), 0o777)
+    with pytest.raises(PermissionError):
+        resumpy.server.get_default_socket_path()
+
+
+def test_no_response(tmp_path):
+    socket_path = str(tmp_path / 'mute.sock')
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+        server.bind(socket_path)
+        server.listen(1)
+        thread = threading.Thread(target=lambda: server.accept()[0].close())
+        thread.start()
+        with pytest.raises(ConnectionError):
+            resumpy.server.send_request(socket_path, {'command': 'ping'})
+        thread.join()
+
+
+def test_metrics(socket_path, tmp_path):
+    resumpy.server.send_request(socket_path, {
+        'command': 'render', 'cv_file': tests.get_example_path(),
+        'theme': 'sitges', 'file_path': str(tmp_path / 'cv'),
+        'priority': 'batch', 'tenant': 'tests'
+    })
+    response = resumpy.server.send_request(
+        socket_path, {'command': 'metrics'}
+    )
+    assert response['metrics']['batch']['completed'] == 1
+    assert response['metrics']['interactive']['submitted'] == 0
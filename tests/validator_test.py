@@ -0,0 +1,80 @@
+import resumpy.validator
+import copy
+import json
+import jsonschema
+import pytest
+import tests
+
+
+def get_schema():
+    with open(tests.get_schema_path()) as schema_file:
+        return json.load(schema_file)
+
+
+def get_invalid_cv_raws():
+    cv_raws = []
+    for path, value in [
+        (['lang'], 'fr'),
+        (['last_update'], '2000-13-01'),
+        (['basic', 'name'], 1),
+        (['contact'], 'john@snow.com'),
+        (['experience', 0, 'date_start'], None),
+        (['education', 0, 'gpa'], True),
+        (['skills', 0, 'score'], 101),
+        (['languages'], {'name': 'English'}),
+        (['projects', 0, 'featured'], 'yes')
+    ]:
+        cv_raw = tests.get_reduced_cv_raw()
+        item = cv_raw
+        for key in path[:-1]:
+            item = item[key]
+        item[path[-1]] = value
+        cv_raws.append(cv_raw)
+    cv_raw = tests.get_reduced_cv_raw()
+    del cv_raw['basic']['surnames']
+    cv_raws.append(cv_raw)
+    cv_raw = tests.get_reduced_cv_raw()
+    cv_raw['awards'].append(copy.deepcopy(cv_raw['awards'][0]))
+    cv_raws.append(cv_raw)
+    return cv_raws
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv('RESUMPY_CACHE_DIR', str(tmp_path))
+    return tmp_path
+
+
+def test_validator_is_compiled(cache_dir):
+    validator = resumpy.validator.Validator(get_schema())
+    assert validator.validate_fn is not None
+    assert len(list((cache_dir / 'validators').glob('*.py'))) == 1
+
+
+@pytest.mark.parametrize('cv_raw', [
+    tests.get_minimal_cv_raw(), tests.get_reduced_cv_raw(),
+    json.load(open(tests.get_example_path()))
+])
+def test_validator_valid(cv_raw):
+    resumpy.validator.Validator(get_schema()).validate(cv_raw)
+
+
+@pytest.mark.parametrize('cv_raw', get_invalid_cv_raws())
+def test_validator_same_errors(cv_raw):
+    validator = resumpy.validator.Validator(get_schema())
+    assert not validator.is_valid(cv_raw)
+    with pytest.raises(jsonschema.ValidationError) as expected_error:
+        jsonschema.validate(cv_raw, get_schema())
+    with pytest.raises(jsonschema.ValidationError) as error:
+        validator.validate(cv_raw)
+    assert error.value.message == expected_error.value.message
+    assert error.value.path == expected_error.value.path
+
+
+def test_validator_fallback():
+    schema = {'anyOf': [{'type': 'string'}, {'type': 'number'}]}
+    validator = resumpy.validator.Validator(schema)
+    assert validator.validate_fn is None
+    validator.validate(1)
+    with pytest.raises(jsonschema.ValidationError):
+        validator.validate([])